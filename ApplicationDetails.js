@@ -48,13 +48,18 @@ const ApplicationDetails = () => {
 
   const fetchApplicationDetails = async () => {
     try {
-      const [appData, evalData] = await Promise.all([
-        apiCall(`/api/applications/${id}`),
-        apiCall(`/api/evaluations/${id}`).catch(() => null) // Evaluation might not exist yet
-      ]);
+      // One round trip; the evaluation is null until it exists
+      const data = await apiCall('/api/applications/lookup', 'POST', {
+        ids: [id],
+        include: ['application', 'evaluation'],
+      });
+      const result = data.results[id];
+      if (!result) {
+        throw new Error('Application not found');
+      }
 
-      setApplication(appData);
-      setEvaluation(evalData);
+      setApplication(result.application);
+      setEvaluation(result.evaluation);
     } catch (error) {
       setError('Failed to load application details');
       console.error('Error fetching application details:', error);
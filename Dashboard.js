@@ -30,7 +30,7 @@ import {
   Warning,
 } from '@mui/icons-material';
 import { useNavigate } from 'react-router-dom';
-import { apiCall } from '../utils/api';
+import { apiCall, subscribeToEvents } from '../utils/api';
 
 const Dashboard = () => {
   const [metrics, setMetrics] = useState({});
@@ -45,6 +45,20 @@ const Dashboard = () => {
     fetchApplications();
   }, []);
 
+  // Agent progress is pushed while the status dialog is open
+  useEffect(() => {
+    if (!selectedApp) return undefined;
+    return subscribeToEvents(`/api/events/agent-status?application_id=${selectedApp}`, (event) => {
+      if (event.type === 'snapshot') {
+        setAgentStatus(event.agents);
+      } else if (event.type === 'agent_status') {
+        setAgentStatus((current) => ({ ...current, [event.agent]: event }));
+      } else if (event.type === 'reset') {
+        apiCall(`/api/agent-status/${selectedApp}`).then(setAgentStatus).catch(() => {});
+      }
+    });
+  }, [selectedApp]);
+
   const fetchDashboardData = async () => {
     try {
       const data = await apiCall('/api/dashboard/metrics');
@@ -56,7 +70,7 @@ const Dashboard = () => {
 
   const fetchApplications = async () => {
     try {
-      const data = await apiCall('/api/applications');
+      const data = await apiCall('/api/applications?limit=10&fields=company_name,founder_names,funding_stage,status,created_at');
       setApplications(data);
       setLoading(false);
     } catch (error) {
@@ -95,14 +109,9 @@ const Dashboard = () => {
     navigate(`/applications/${app.id}`);
   };
 
-  const handleViewAgentStatus = async (appId) => {
-    try {
-      const status = await apiCall(`/api/agent-status/${appId}`);
-      setAgentStatus(status);
-      setSelectedApp(appId);
-    } catch (error) {
-      console.error('Error fetching agent status:', error);
-    }
+  const handleViewAgentStatus = (appId) => {
+    setAgentStatus({});
+    setSelectedApp(appId);
   };
 
   if (loading) {
@@ -0,0 +1,111 @@
+# agent_scheduler.py - Dependency-aware scheduler for orchestrator agents
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class AgentStage:
+    """A single agent in the evaluation pipeline and the stages it waits on
+
+    CPU-bound stages take a plain (synchronous) module-level handler that is
+    executed in the named process pool instead of on the event loop. Batched
+    stages take a handler over a list of (application, inputs) pairs so that
+    concurrent evaluations can share a single call. Cacheable stages have
+    their output memoized by input content; bump `version` whenever the
+    stage logic changes so stale outputs are no longer served.
+
+    `timeout` bounds how long the stage may run, in seconds. `hedge_after`
+    launches a duplicate call if the first has not finished after that many
+    seconds and takes whichever returns first, trimming long-tailed latency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[..., Any],
+        depends_on: Optional[List[str]] = None,
+        cpu_bound: bool = False,
+        pool: str = "cpu",
+        batched: bool = False,
+        max_batch_size: int = 32,
+        max_batch_wait: float = 0.05,
+        cacheable: bool = False,
+        version: str = "1",
+        timeout: Optional[float] = None,
+        hedge_after: Optional[float] = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.depends_on = list(depends_on or [])
+        self.cpu_bound = cpu_bound
+        self.pool = pool
+        self.batched = batched
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.cacheable = cacheable
+        self.version = version
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+
+    def __repr__(self):
+        return f"AgentStage({self.name!r}, depends_on={self.depends_on!r})"
+
+
+class AgentDAG:
+    """Runs agent stages as soon as all of their dependencies have produced output"""
+
+    def __init__(self, stages: List[AgentStage]):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Duplicate agent stage names")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        remaining = {}
+        for name, stage in self.stages.items():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Agent stage '{name}' depends on unknown stage '{dep}'")
+            remaining[name] = set(stage.depends_on)
+
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Agent stages contain a dependency cycle: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    async def run(
+        self,
+        execute: Callable[[AgentStage, Dict[str, Any]], Awaitable[Any]],
+        completed: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Execute every stage not already in `completed` and return all stage outputs"""
+        results = dict(completed or {})
+        pending = [name for name in self.order if name not in results]
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if all(dep in results for dep in stage.depends_on):
+                        inputs = {dep: results[dep] for dep in stage.depends_on}
+                        running[asyncio.create_task(execute(stage, inputs))] = name
+                        pending.remove(name)
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results[running.pop(task)] = task.result()
+        finally:
+            # A failed or cancelled stage aborts the run; don't leave siblings behind
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return results
@@ -0,0 +1,128 @@
+# agent_status.py - Compact per-application agent status with time-based eviction
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Status names are stored as 1-based codes; 0 marks an agent with no entry yet
+AGENT_STATES = ("pending", "processing", "completed", "skipped", "cancelled", "timeout", "error")
+STATE_CODES = {state: code for code, state in enumerate(AGENT_STATES, start=1)}
+
+
+class AgentStatusRecord:
+    """Status of every agent for one application, indexed by agent slot"""
+
+    __slots__ = ("states", "progress", "reasons")
+
+    def __init__(self, slots: int):
+        self.states = bytearray(slots)
+        self.progress = bytearray(slots)
+        # Most entries share a handful of interned reason strings
+        self.reasons: List[Optional[str]] = [None] * slots
+
+    def grow(self, slots: int):
+        missing = slots - len(self.states)
+        if missing > 0:
+            self.states.extend(bytes(missing))
+            self.progress.extend(bytes(missing))
+            self.reasons.extend([None] * missing)
+
+
+class AgentStatusStore:
+    """One slotted record per application instead of a dict per (application, agent)
+
+    Agents are assigned slots on first use. Once an application's evaluation
+    is finished its record stays readable until `evict` is called with a
+    cutoff past its finish time.
+    """
+
+    def __init__(self):
+        self._slots: Dict[str, int] = {}
+        self._agents: List[str] = []
+        self._records: Dict[str, AgentStatusRecord] = {}
+        # application_id -> finished_at, oldest first
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _slot(self, agent: str) -> int:
+        slot = self._slots.get(agent)
+        if slot is None:
+            slot = self._slots[agent] = len(self._agents)
+            self._agents.append(agent)
+        return slot
+
+    def set(self, app_id: str, agent: str, status: str, progress: int, reason: Optional[str] = None):
+        slot = self._slot(agent)
+        record = self._records.get(app_id)
+        if record is None:
+            record = self._records[app_id] = AgentStatusRecord(len(self._agents))
+        elif slot >= len(record.states):
+            record.grow(len(self._agents))
+        record.states[slot] = STATE_CODES[status]
+        record.progress[slot] = progress
+        record.reasons[slot] = reason
+        # A finished application that changes again (e.g. a resumed run) is live
+        self._finished.pop(app_id, None)
+
+    def get(self, app_id: str) -> Dict[str, Dict[str, Any]]:
+        """Agent name -> status entry for every agent with an entry"""
+        record = self._records.get(app_id)
+        if record is None:
+            return {}
+        return {
+            self._agents[slot]: {
+                "agent": self._agents[slot],
+                "status": AGENT_STATES[code - 1],
+                "progress": record.progress[slot],
+                "reason": record.reasons[slot],
+            }
+            for slot, code in enumerate(record.states) if code
+        }
+
+    def finish(self, app_id: str, finished_at: Optional[float] = None):
+        """Start the retention clock for an application whose evaluation is over"""
+        if app_id in self._records:
+            self._finished.pop(app_id, None)
+            self._finished[app_id] = time.time() if finished_at is None else finished_at
+
+    def evict(self, finished_before: float) -> int:
+        """Drop records of applications finished before the cutoff; returns how many"""
+        evicted = 0
+        while self._finished:
+            app_id, finished_at = next(iter(self._finished.items()))
+            if finished_at >= finished_before:
+                break
+            del self._finished[app_id]
+            self._records.pop(app_id, None)
+            evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    def export(self) -> Tuple[Iterator[Tuple[str, str, str, int, Optional[str]]], List[Tuple[str, float]]]:
+        """(app_id, agent, status, progress, reason) entries and (app_id, finished_at) pairs
+
+        The record list is captured up front and the entries are produced
+        lazily, so a snapshot can be serialised off the event loop while the
+        store keeps changing underneath it.
+        """
+        records = list(self._records.items())
+        agents = list(self._agents)
+        finished = list(self._finished.items())
+
+        def entries():
+            for app_id, record in records:
+                for slot in range(min(len(record.states), len(agents))):
+                    code = record.states[slot]
+                    if code:
+                        yield app_id, agents[slot], AGENT_STATES[code - 1], record.progress[slot], record.reasons[slot]
+
+        return entries(), finished
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "applications": len(self._records),
+            "finished": len(self._finished),
+            "evicted": self.evicted,
+        }
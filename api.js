@@ -62,3 +62,16 @@ export const uploadFile = async (endpoint, file) => {
     throw error;
   }
 };
+
+// Server-sent events; EventSource can't set headers, so the token goes in the query string
+export const subscribeToEvents = (endpoint, onEvent) => {
+  const token = localStorage.getItem('auth_token');
+  const separator = endpoint.includes('?') ? '&' : '?';
+  const url = `${API_BASE_URL}${endpoint}${token ? `${separator}token=${encodeURIComponent(token)}` : ''}`;
+  const source = new EventSource(url);
+
+  source.onmessage = (message) => onEvent(JSON.parse(message.data));
+  source.onerror = (error) => console.error('Event stream error:', error);
+
+  return () => source.close();
+};
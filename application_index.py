@@ -0,0 +1,243 @@
+# application_index.py - Secondary indexes for filtering applications without a full scan
+import bisect
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Fields looked up by equality (hash sets) and by range (sorted keys)
+CATEGORICAL_FIELDS = ("status", "funding_stage", "recommendation")
+RANGE_FIELDS = ("created_at", "overall_score")
+
+# Bulk updates touching more entries than this re-sort a range index instead
+# of moving entries one at a time
+REBUILD_THRESHOLD = 256
+
+
+class SortedIndex:
+    """Ids ordered by (key, id), kept as parallel lists for bisect range lookups"""
+
+    def __init__(self):
+        self._keys: List[float] = []
+        self._ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _position(self, key: float, item_id: str, after: bool = False) -> int:
+        # Within a run of equal keys the ids are sorted too
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_right(self._keys, key, start)
+        if after:
+            return bisect.bisect_right(self._ids, item_id, start, end)
+        return bisect.bisect_left(self._ids, item_id, start, end)
+
+    def add(self, key: float, item_id: str):
+        position = self._position(key, item_id)
+        self._keys.insert(position, key)
+        self._ids.insert(position, item_id)
+
+    def remove(self, key: float, item_id: str):
+        position = self._position(key, item_id)
+        if position < len(self._ids) and self._keys[position] == key and self._ids[position] == item_id:
+            del self._keys[position]
+            del self._ids[position]
+
+    def rebuild(self, entries: Iterable[Tuple[float, str]]):
+        ordered = sorted(entries)
+        self._keys = [key for key, _ in ordered]
+        self._ids = [item_id for _, item_id in ordered]
+
+    def bounds(self, low: Optional[float] = None, high: Optional[float] = None,
+               after: Optional[Tuple[float, str]] = None) -> Tuple[int, int]:
+        """Positions [start, end) of keys in low..high, starting past the (key, id) `after`"""
+        start = 0 if low is None else bisect.bisect_left(self._keys, low)
+        if after is not None:
+            start = max(start, self._position(*after, after=True))
+        end = len(self._keys) if high is None else bisect.bisect_right(self._keys, high)
+        return start, max(start, end)
+
+    def count(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        start, end = self.bounds(low, high)
+        return end - start
+
+    def ids(self, low: Optional[float] = None, high: Optional[float] = None) -> List[str]:
+        """Ids with low <= key <= high (either bound optional), in key order"""
+        start, end = self.bounds(low, high)
+        return self._ids[start:end]
+
+    def slice(self, start: int, end: int) -> List[str]:
+        return self._ids[start:end]
+
+
+class ApplicationIndex:
+    """Hash indexes on categorical fields and sorted indexes on range fields
+
+    `query` walks the created_at order, filtering as it goes until a page is
+    full, or starts from the most selective predicate and narrows it with the
+    others, so its cost follows the page size or that predicate's match
+    count, not the portfolio size.
+    Results are ordered by (created_at, id), like the SQL listing.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Dict[str, Any]] = {}
+        self._categorical: Dict[str, Dict[Any, Set[str]]] = {field: defaultdict(set) for field in CATEGORICAL_FIELDS}
+        self._sorted: Dict[str, SortedIndex] = {field: SortedIndex() for field in RANGE_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _unindex(self, item_id: str, field: str, value: Any):
+        if value is None:
+            return
+        if field in self._categorical:
+            members = self._categorical[field][value]
+            members.discard(item_id)
+            if not members:
+                del self._categorical[field][value]
+        else:
+            self._sorted[field].remove(value, item_id)
+
+    def _index(self, item_id: str, field: str, value: Any):
+        if value is None:
+            return
+        if field in self._categorical:
+            self._categorical[field][value].add(item_id)
+        else:
+            self._sorted[field].add(value, item_id)
+
+    def update(self, item_id: str, **fields: Any):
+        """Set indexed fields of one item; None removes the field from its index"""
+        current = self._values.setdefault(item_id, {})
+        for field, value in fields.items():
+            old = current.get(field)
+            if old == value and field in current:
+                continue
+            self._unindex(item_id, field, old)
+            current[field] = value
+            self._index(item_id, field, value)
+
+    def update_many(self, updates: List[Tuple[str, Dict[str, Any]]]):
+        if len(updates) <= REBUILD_THRESHOLD:
+            for item_id, fields in updates:
+                self.update(item_id, **fields)
+            return
+
+        stale = set()
+        for item_id, fields in updates:
+            current = self._values.setdefault(item_id, {})
+            for field, value in fields.items():
+                old = current.get(field)
+                if old == value and field in current:
+                    continue
+                current[field] = value
+                if field in self._categorical:
+                    self._unindex(item_id, field, old)
+                    self._index(item_id, field, value)
+                else:
+                    stale.add(field)
+        for field in stale:
+            self._sorted[field].rebuild(
+                (values[field], item_id) for item_id, values in self._values.items()
+                if values.get(field) is not None
+            )
+
+    def load(self, values: Dict[str, Dict[str, Any]]):
+        """Replace the whole index with the given indexed fields per item, built in bulk"""
+        self._values = values
+        for members in self._categorical.values():
+            members.clear()
+        entries: Dict[str, List[Tuple[float, str]]] = {field: [] for field in RANGE_FIELDS}
+        for item_id, fields in values.items():
+            for field, value in fields.items():
+                if value is None:
+                    continue
+                if field in self._categorical:
+                    self._categorical[field][value].add(item_id)
+                else:
+                    entries[field].append((value, item_id))
+        for field, index in self._sorted.items():
+            index.rebuild(entries[field])
+
+    def counts(self, field: str) -> Dict[Any, int]:
+        """Number of items per value of a categorical field"""
+        return {value: len(members) for value, members in self._categorical[field].items()}
+
+    def remove(self, item_id: str):
+        for field, value in self._values.pop(item_id, {}).items():
+            self._unindex(item_id, field, value)
+
+    def _in_ranges(self, item_ids: Iterable[str], ranges: Dict[str, Tuple[Optional[float], Optional[float]]]):
+        for field, (low, high) in ranges.items():
+            item_ids = [
+                item_id for item_id in item_ids
+                if (value := self._values[item_id].get(field)) is not None
+                and (low is None or value >= low) and (high is None or value <= high)
+            ]
+        return item_ids
+
+    def query(
+        self,
+        equals: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        after: Optional[Tuple[float, str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Ids matching every equality and (low, high) range predicate, ordered by (created_at, id)
+
+        `after` is the (created_at, id) of the last item of the previous page;
+        `limit` caps the number of ids returned.
+        """
+        equals = {field: value for field, value in (equals or {}).items() if value is not None}
+        ranges = {field: bounds for field, bounds in (ranges or {}).items() if bounds != (None, None)}
+        created = self._sorted["created_at"]
+        created_low, created_high = ranges.pop("created_at", (None, None))
+        start, end = created.bounds(created_low, created_high, after=after)
+        member_sets = sorted((self._categorical[field].get(value, set()) for field, value in equals.items()), key=len)
+        range_sizes = sorted((self._sorted[field].count(*bounds), field) for field, bounds in ranges.items())
+
+        # Walk the created_at order, filtering as we go, for at most as many
+        # entries as seeding from the smallest hash set or range slice would
+        # touch; if the page still isn't full, seed from that predicate instead.
+        # Either way the cost stays within twice the cheaper plan, without
+        # guessing how correlated the predicates are.
+        seed_sizes = [len(members) for members in member_sets] + [size for size, _ in range_sizes]
+        budget = min(seed_sizes) if seed_sizes else None
+        if budget is None or (limit is not None or end - start <= budget):
+            matches: List[str] = []
+            position, chunk = start, max(limit or 0, 256)
+            while position < end and (limit is None or len(matches) < limit):
+                if budget is not None and position - start >= budget:
+                    break
+                block = created.slice(position, min(end, position + chunk))
+                position += len(block)
+                chunk *= 2
+                candidates = iter(block)
+                for members in member_sets:
+                    candidates = filter(members.__contains__, candidates)
+                matches.extend(self._in_ranges(candidates, ranges))
+            if position >= end or (limit is not None and len(matches) >= limit):
+                return matches[:limit] if limit is not None else matches
+
+        # Seed from the most selective predicate: a range slice is filtered
+        # through the hash sets (smallest first, so most ids drop out early),
+        # otherwise the hash sets are intersected directly
+        if range_sizes and (not member_sets or range_sizes[0][0] < len(member_sets[0])):
+            field = range_sizes[0][1]
+            candidates = self._sorted[field].ids(*ranges.pop(field))
+            for members in member_sets:
+                candidates = filter(members.__contains__, candidates)
+        else:
+            candidates = member_sets[0].intersection(*member_sets[1:])
+
+        # Remaining predicates and the created_at window are checked on the
+        # surviving candidates
+        matches = []
+        for item_id in self._in_ranges(candidates, ranges):
+            key = (self._values[item_id].get("created_at"), item_id)
+            if key[0] is None or (created_low is not None and key[0] < created_low):
+                continue
+            if (created_high is not None and key[0] > created_high) or (after is not None and key <= after):
+                continue
+            matches.append(key)
+        matches.sort()
+        return [item_id for _, item_id in (matches[:limit] if limit is not None else matches)]
@@ -0,0 +1,131 @@
+# bench_export.py - Throughput and peak memory of the streaming portfolio export
+#
+# Usage: python bench_export.py [--rows 1000000] [--format ndjson|csv] [--database-url sqlite:///export.db]
+#
+# The portfolio is written by a child process so the peak RSS reported here
+# covers only importing the backend and streaming the export. Without
+# --database-url a temporary SQLite database is populated and removed.
+import argparse
+import asyncio
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def populate(database_url: str, rows: int, batch_size: int = 5000):
+    os.environ["DATABASE_URL"] = database_url
+    from backend_main import EvaluationResult, StartupApplication, classify_score
+    from repository import create_repository
+
+    repository = create_repository(database_url, StartupApplication, EvaluationResult)
+    await repository.start()
+    random.seed(7)
+    started = datetime.now() - timedelta(days=365)
+    try:
+        for start in range(0, rows, batch_size):
+            applications, evaluations = [], []
+            for i in range(start, min(start + batch_size, rows)):
+                app_id = f"app-{i:08d}"
+                applications.append(StartupApplication(
+                    id=app_id,
+                    company_name=f"Startup {i}",
+                    founder_names=["Ada Founder", "Grace Builder"],
+                    email=f"founders{i}@example.com",
+                    business_description="AI-powered workflow automation for mid-market finance teams",
+                    funding_stage=random.choice(["Pre-Seed", "Seed", "Series A", "Series B"]),
+                    funding_amount=random.uniform(2e5, 2e7),
+                    status="evaluated",
+                    created_at=started + timedelta(seconds=i)
+                ))
+                scores = [random.uniform(3, 10) for _ in range(4)]
+                overall = sum(scores) / 4
+                recommendation, risk_level = classify_score(overall)
+                evaluations.append(EvaluationResult(
+                    application_id=app_id,
+                    founder_market_fit_score=scores[0],
+                    market_opportunity_score=scores[1],
+                    business_model_score=scores[2],
+                    traction_score=scores[3],
+                    risk_level=risk_level,
+                    overall_score=overall,
+                    recommendation=recommendation,
+                    key_insights=["Strong founder-market fit", "Large addressable market"],
+                    red_flags=["High competition"],
+                    strengths=["Strong technical team"]
+                ))
+            await repository.save_applications(applications)
+            await repository.save_evaluations(evaluations)
+    finally:
+        await repository.close()
+
+
+async def export(database_url: str, export_format: str, filters: dict):
+    os.environ["DATABASE_URL"] = database_url
+    import backend_main
+
+    # Only the repository is started: the app's startup hook loads every
+    # application into the in-memory indexes, which is not what is measured here
+    await backend_main.repository.start()
+    baseline = max_rss_mb()
+    try:
+        rows = 0
+        size = 0
+        started = time.perf_counter()
+        response = await backend_main.export_portfolio(format=export_format, user={}, **filters)
+        async for chunk in response.body_iterator:
+            size += len(chunk.encode())
+            rows += chunk.count("\n")
+        seconds = time.perf_counter() - started
+    finally:
+        await backend_main.repository.close()
+
+    if export_format == "csv":
+        # Header row
+        rows -= 1
+    print(f"export ({export_format}, batches of {backend_main.EXPORT_BATCH_SIZE})")
+    print(f"  rows                    {rows:>12,}")
+    print(f"  elapsed                 {seconds:>12,.1f} s")
+    print(f"  throughput              {rows / seconds:>12,.0f} rows/s  ({size / seconds / 2**20:,.1f} MB/s)")
+    print(f"  output                  {size / 2**20:>12,.1f} MB")
+    print(f"  peak RSS before export  {baseline:>12,.1f} MB")
+    print(f"  peak RSS after export   {max_rss_mb():>12,.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--database-url", default=None, help="export an existing database instead of a generated one")
+    parser.add_argument("--recommendation", default=None, help="server-side filter to apply")
+    parser.add_argument("--populate", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.populate:
+        asyncio.run(populate(args.populate, args.rows))
+        return
+
+    filters = {"recommendation": args.recommendation} if args.recommendation else {}
+    if args.database_url:
+        asyncio.run(export(args.database_url, args.format, filters))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'export.db')}"
+        started = time.perf_counter()
+        subprocess.run([sys.executable, __file__, "--rows", str(args.rows), "--populate", database_url], check=True)
+        print(f"populated {args.rows:,} applications and evaluations in {time.perf_counter() - started:,.1f} s")
+        asyncio.run(export(database_url, args.format, filters))
+
+
+if __name__ == "__main__":
+    main()
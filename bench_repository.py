@@ -0,0 +1,188 @@
+# bench_repository.py - Read/write throughput of the repository backends vs plain dicts
+#
+# Usage: python bench_repository.py [--records 20000] [--concurrency 64] [--sqlite-path bench.db]
+#                                   [--restart-records 1000000]
+import argparse
+import asyncio
+import gc
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from backend_main import EvaluationResult, StartupApplication
+from agent_status import AgentStatusStore
+from repository import (
+    WAL_SNAPSHOT_APPLICATIONS, WAL_SNAPSHOT_EVALUATIONS, SNAPSHOT_CHUNK,
+    ColumnCodec, DurableMemoryRepository, MemoryRepository, SQLiteRepository,
+)
+from write_ahead_log import WriteAheadLog, pack
+
+
+def make_applications(count: int, start: int = 0):
+    now = datetime.now()
+    return [
+        StartupApplication(
+            id=f"app-{i:08d}",
+            company_name=f"Startup {i}",
+            founder_names=["Ada Founder", "Grace Builder"],
+            email=f"founders{i}@example.com",
+            business_description="AI-powered workflow automation for mid-market finance teams",
+            funding_stage=random.choice(["Pre-Seed", "Seed", "Series A", "Series B"]),
+            funding_amount=random.uniform(2e5, 2e7),
+            created_at=now
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def make_evaluations(applications):
+    return [
+        EvaluationResult(
+            application_id=application.id,
+            founder_market_fit_score=random.uniform(3, 10),
+            market_opportunity_score=random.uniform(3, 10),
+            business_model_score=random.uniform(3, 10),
+            traction_score=random.uniform(3, 10),
+            risk_level=random.choice(["LOW", "MEDIUM", "HIGH"]),
+            overall_score=random.uniform(3, 10),
+            recommendation=random.choice(["INVEST", "REVIEW", "PASS"]),
+            key_insights=["Strong founder-market fit", "Large addressable market"],
+            red_flags=["High competition"],
+            strengths=["Strong technical team"]
+        )
+        for application in applications
+    ]
+
+
+async def write_snapshot(directory: str, count: int):
+    """A snapshot of `count` applications and their evaluations, in DurableMemoryRepository's format
+
+    Generated chunk by chunk, so building it never holds the whole portfolio.
+    """
+    applications, evaluations = ColumnCodec(StartupApplication), ColumnCodec(EvaluationResult)
+
+    def records():
+        for start in range(0, count, SNAPSHOT_CHUNK):
+            chunk = make_applications(min(SNAPSHOT_CHUNK, count - start), start)
+            yield WAL_SNAPSHOT_APPLICATIONS, pack(applications.encode(chunk))
+            yield WAL_SNAPSHOT_EVALUATIONS, pack(evaluations.encode(make_evaluations(chunk)))
+
+    log = WriteAheadLog(directory, fsync=False, snapshot_source=records)
+    await log.start()
+    await log.snapshot()
+    await log.close()
+
+
+def report(label: str, operations: int, seconds: float):
+    print(f"  {label:<34} {operations / seconds:>12,.0f} ops/s  ({seconds * 1000:,.1f} ms)")
+
+
+async def run_in_chunks(coroutines, concurrency: int):
+    for start in range(0, len(coroutines), concurrency):
+        await asyncio.gather(*coroutines[start:start + concurrency])
+
+
+async def bench_dicts(applications, lookups):
+    print("dict (current applications_db)")
+    store = {}
+    started = time.perf_counter()
+    for application in applications:
+        store[application.id] = application
+    report("single writes", len(applications), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for app_id in lookups:
+        store.get(app_id)
+    report("point reads", len(lookups), time.perf_counter() - started)
+
+
+async def bench_repository(label: str, repository, applications, lookups, concurrency: int):
+    print(label)
+    await repository.start()
+    try:
+        half = len(applications) // 2
+
+        started = time.perf_counter()
+        await run_in_chunks([repository.save_application(a) for a in applications[:half]], concurrency)
+        report(f"concurrent single writes (x{concurrency})", half, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for start in range(half, len(applications), 500):
+            await repository.save_applications(applications[start:start + 500])
+        report("batched writes (500/batch)", len(applications) - half, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await run_in_chunks([repository.get_application(app_id) for app_id in lookups], concurrency)
+        report(f"concurrent point reads (x{concurrency})", len(lookups), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for start in range(0, len(lookups), 100):
+            await repository.get_applications(lookups[start:start + 100])
+        report("batched reads (100/batch)", len(lookups), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        listed = await repository.list_applications()
+        report("full listing", len(listed), time.perf_counter() - started)
+    finally:
+        await repository.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--sqlite-path", default=None)
+    parser.add_argument("--restart-records", type=int, default=1000000,
+                        help="applications (each with an evaluation) in the restart benchmark; 0 skips it")
+    args = parser.parse_args()
+
+    random.seed(7)
+    applications = make_applications(args.records)
+    lookups = [random.choice(applications).id for _ in range(args.records)]
+
+    await bench_dicts(applications, lookups)
+    await bench_repository("MemoryRepository", MemoryRepository({}, {}, AgentStatusStore()), applications, lookups, args.concurrency)
+
+    with tempfile.TemporaryDirectory() as directory:
+        await bench_repository(
+            "DurableMemoryRepository (write-ahead log, fsync)",
+            DurableMemoryRepository(os.path.join(directory, "wal"), StartupApplication, EvaluationResult,
+                                    {}, {}, AgentStatusStore()),
+            applications, lookups, args.concurrency
+        )
+        started = time.perf_counter()
+        recovered = DurableMemoryRepository(os.path.join(directory, "wal"), StartupApplication, EvaluationResult,
+                                            {}, {}, AgentStatusStore())
+        await recovered.start()
+        report("restart (snapshot + log replay)", len(recovered.applications), time.perf_counter() - started)
+        await recovered.close()
+
+    if args.restart_records:
+        with tempfile.TemporaryDirectory() as directory:
+            await write_snapshot(directory, args.restart_records)
+            print(f"DurableMemoryRepository restart, {args.restart_records:,} applications + evaluations")
+            started = time.perf_counter()
+            recovered = DurableMemoryRepository(directory, StartupApplication, EvaluationResult,
+                                                {}, {}, AgentStatusStore())
+            # As the app's startup hook loads it
+            gc.disable()
+            try:
+                await recovered.start()
+            finally:
+                gc.enable()
+            report("restart (snapshot)", len(recovered.applications) + len(recovered.evaluations),
+                   time.perf_counter() - started)
+            await recovered.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.sqlite_path or os.path.join(directory, "bench.db")
+        await bench_repository(
+            "SQLiteRepository", SQLiteRepository(path, StartupApplication, EvaluationResult),
+            applications, lookups, args.concurrency
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
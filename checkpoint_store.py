@@ -0,0 +1,77 @@
+# checkpoint_store.py - Durable checkpoints of in-flight evaluations
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Tuple
+
+
+class CheckpointStore:
+    """SQLite record of unfinished evaluations and their completed stage outputs
+
+    An evaluation is registered when it is accepted, each finished stage's
+    output is written as it completes, and everything is removed once the
+    evaluation is stored. Whatever remains at startup was interrupted and can
+    be resumed from its last completed stage.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pending_evaluations (
+                application_id TEXT PRIMARY KEY,
+                application TEXT NOT NULL,
+                accepted_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS stage_checkpoints (
+                application_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                version TEXT NOT NULL,
+                output TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (application_id, stage)
+            )
+        """)
+
+    def begin(self, entries: List[Tuple[str, str]]):
+        """Register (application_id, application_json) pairs as accepted"""
+        now = time.time()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pending_evaluations VALUES (?, ?, ?)",
+                [(app_id, application, now) for app_id, application in entries]
+            )
+
+    def save_stage(self, app_id: str, stage: str, version: str, output: Any):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO stage_checkpoints VALUES (?, ?, ?, ?, ?)",
+            (app_id, stage, version, json.dumps(output, default=str), time.time())
+        )
+
+    def completed_stages(self, app_id: str) -> Dict[str, Tuple[str, Any]]:
+        """Stage name -> (version, output) for every checkpointed stage"""
+        rows = self._conn.execute(
+            "SELECT stage, version, output FROM stage_checkpoints WHERE application_id = ?",
+            (app_id,)
+        )
+        return {stage: (version, json.loads(output)) for stage, version, output in rows}
+
+    def finish(self, app_id: str):
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM stage_checkpoints WHERE application_id = ?", (app_id,))
+            self._conn.execute("DELETE FROM pending_evaluations WHERE application_id = ?", (app_id,))
+
+    def unfinished(self) -> List[Tuple[str, str]]:
+        """(application_id, application_json) for accepted but unfinished evaluations, oldest first"""
+        return self._conn.execute(
+            "SELECT application_id, application FROM pending_evaluations ORDER BY accepted_at"
+        ).fetchall()
+
+    def close(self):
+        self._conn.close()
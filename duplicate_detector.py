@@ -0,0 +1,86 @@
+# duplicate_detector.py - Near-duplicate detection with MinHash signatures and LSH banding
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from search_index import tokenize
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def shingles(description: str, founder_names: Iterable[str], size: int = 2) -> Set[str]:
+    """Word n-grams of the description plus one feature per normalised founder name"""
+    tokens = tokenize(description)
+    features = {" ".join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))} if tokens else set()
+    features.update("founder:" + " ".join(tokenize(name)) for name in founder_names if tokenize(name))
+    return features
+
+
+class DuplicateDetector:
+    """MinHash signatures bucketed by LSH bands
+
+    Two items whose shingle sets have Jaccard similarity s share at least one
+    band bucket with probability 1 - (1 - s^rows)^bands, so with the default
+    32 bands of 4 rows near-duplicates (s >= 0.7) are found ~99.98% of the
+    time while items below s = 0.3 rarely collide. A lookup only touches the
+    items in its own buckets, and candidates are confirmed against
+    `threshold` using the signature-estimated similarity.
+    """
+
+    def __init__(self, bands: int = 32, rows: int = 4, threshold: float = 0.7, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        permutations = bands * rows
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=permutations, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=permutations, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[str]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, features: Set[str]) -> np.ndarray:
+        if not features:
+            return np.full(self.bands * self.rows, MERSENNE_PRIME, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(feature.encode()) for feature in features), dtype=np.uint64, count=len(features))
+        # (a * x + b) mod p, with x and a below 2^32 so the product fits in 64 bits
+        return ((np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME).min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, item_id: str, signature: np.ndarray):
+        if item_id in self._signatures:
+            self.remove(item_id)
+        self._signatures[item_id] = signature
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            buckets[key].append(item_id)
+
+    def remove(self, item_id: str):
+        signature = self._signatures.pop(item_id, None)
+        if signature is None:
+            return
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            members = buckets.get(key)
+            if members and item_id in members:
+                members.remove(item_id)
+                if not members:
+                    del buckets[key]
+
+    def find(self, signature: np.ndarray, exclude: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """Most similar stored item at or above the threshold, as (item_id, estimated Jaccard)"""
+        candidates = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(key, ()))
+        candidates.discard(exclude)
+
+        best = None
+        for item_id in candidates:
+            similarity = float(np.mean(self._signatures[item_id] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (item_id, round(similarity, 4))
+        return best
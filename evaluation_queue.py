@@ -0,0 +1,182 @@
+# evaluation_queue.py - Bounded worker queue for background evaluations
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+
+# Priority class -> scheduling delay in seconds. A job is ordered by its
+# enqueue time plus its class delay, so a waiting low-priority job ages ahead
+# of any urgent job submitted more than that delay after it and is never starved.
+PRIORITY_DELAYS = {
+    "urgent": 0.0,
+    "high": 30.0,
+    "normal": 120.0,
+    "low": 300.0,
+}
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its maximum depth"""
+
+
+def _wait_summary(samples) -> Dict[str, Any]:
+    waits = sorted(samples)
+    if not waits:
+        return {"samples": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    def percentile(q: float) -> float:
+        return round(waits[int(q * (len(waits) - 1))], 4)
+
+    return {
+        "samples": len(waits),
+        "mean": round(sum(waits) / len(waits), 4),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(waits[-1], 4),
+    }
+
+
+class EvaluationQueue:
+    """Fixed pool of workers draining a bounded, priority-ordered queue of evaluation jobs"""
+
+    def __init__(
+        self,
+        worker_count: int = 4,
+        max_depth: int = 1000,
+        wait_sample_size: int = 1000,
+        priority_delays: Optional[Dict[str, float]] = None,
+    ):
+        if worker_count < 1:
+            raise ValueError("worker_count must be at least 1")
+        self.worker_count = worker_count
+        self.max_depth = max_depth
+        self.priority_delays = dict(priority_delays or PRIORITY_DELAYS)
+        self._heap: List[tuple] = []
+        self._cancelled: Set[str] = set()
+        self._sequence = itertools.count()
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+        self._busy_workers = 0
+        self._busy_seconds = 0.0
+        self._started_at = 0.0
+        self._wait_times = deque(maxlen=wait_sample_size)
+        self._class_wait_times = {name: deque(maxlen=wait_sample_size) for name in self.priority_delays}
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.cancelled = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._heap) - len(self._cancelled)
+
+    def start(self):
+        if self._workers:
+            return
+        self._ready = asyncio.Semaphore(len(self._heap))
+        self._started_at = time.monotonic()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._ready = None
+
+    def submit(self, job_id: str, job: Callable[[], Awaitable[Any]], priority: str = "normal") -> int:
+        """Enqueue a job and return its 1-based position in the queue"""
+        if self._ready is None:
+            raise RuntimeError("Evaluation queue has not been started")
+        if priority not in self.priority_delays:
+            raise ValueError(f"Unknown priority class '{priority}'")
+        if self.depth >= self.max_depth:
+            self.rejected += 1
+            raise QueueFullError(f"Evaluation queue is full ({self.max_depth} jobs waiting)")
+
+        enqueued_at = time.monotonic()
+        sort_key = enqueued_at + self.priority_delays[priority]
+        position = 1 + sum(1 for entry in self._heap if entry[0] <= sort_key and entry[2] not in self._cancelled)
+        heapq.heappush(self._heap, (sort_key, next(self._sequence), job_id, priority, job, enqueued_at))
+        self._ready.release()
+        self.submitted += 1
+        return position
+
+    def cancel(self, job_id: str) -> bool:
+        """Withdraw a job that is still waiting; False if it isn't queued"""
+        if job_id in self._cancelled or not any(entry[2] == job_id for entry in self._heap):
+            return False
+        # Lazily deleted: the entry stays in the heap and workers discard it
+        self._cancelled.add(job_id)
+        self.cancelled += 1
+        return True
+
+    def reprioritize(self, job_id: str, priority: str) -> bool:
+        """Move a waiting job to another priority class, keeping the time it was enqueued"""
+        if priority not in self.priority_delays:
+            raise ValueError(f"Unknown priority class '{priority}'")
+        if job_id in self._cancelled:
+            return False
+        for i, (_, sequence, entry_id, _, job, enqueued_at) in enumerate(self._heap):
+            if entry_id == job_id:
+                self._heap[i] = (enqueued_at + self.priority_delays[priority], sequence, job_id, priority, job, enqueued_at)
+                heapq.heapify(self._heap)
+                return True
+        return False
+
+    async def _worker(self):
+        while True:
+            await self._ready.acquire()
+            _, _, job_id, priority, job, enqueued_at = heapq.heappop(self._heap)
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                continue
+            started_at = time.monotonic()
+            self._wait_times.append(started_at - enqueued_at)
+            self._class_wait_times[priority].append(started_at - enqueued_at)
+            self._busy_workers += 1
+            try:
+                await job()
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                print(f"Evaluation job {job_id} failed: {e}")
+            finally:
+                self._busy_workers -= 1
+                self._busy_seconds += time.monotonic() - started_at
+
+    def metrics(self) -> Dict[str, Any]:
+        depth_by_class = {name: 0 for name in self.priority_delays}
+        for entry in self._heap:
+            if entry[2] not in self._cancelled:
+                depth_by_class[entry[3]] += 1
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        capacity = uptime * self.worker_count
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "workers": self.worker_count,
+            "busy_workers": self._busy_workers,
+            "utilisation": round(self._busy_seconds / capacity, 4) if capacity else 0.0,
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "wait_seconds": _wait_summary(self._wait_times),
+            "priority_classes": {
+                name: {
+                    "delay_seconds": delay,
+                    "depth": depth_by_class[name],
+                    "wait_seconds": _wait_summary(self._class_wait_times[name]),
+                }
+                for name, delay in self.priority_delays.items()
+            },
+        }
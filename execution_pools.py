@@ -0,0 +1,47 @@
+# execution_pools.py - Managed process pools for CPU-bound agent stages
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class ExecutionPools:
+    """Lazily created, size-limited ProcessPoolExecutors keyed by pool name
+
+    Work sent to a pool is pickled into a worker process, so handlers must be
+    module-level functions and their arguments and return values picklable.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = dict(limits)
+        self._pools: Dict[str, ProcessPoolExecutor] = {}
+        self._active: Dict[str, int] = {name: 0 for name in self.limits}
+
+    def get(self, name: str) -> ProcessPoolExecutor:
+        if name not in self.limits:
+            raise KeyError(f"Unknown execution pool '{name}'")
+        if name not in self._pools:
+            self._pools[name] = ProcessPoolExecutor(max_workers=self.limits[name])
+        return self._pools[name]
+
+    async def run(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        pool = self.get(name)
+        self._active[name] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        finally:
+            self._active[name] -= 1
+
+    def shutdown(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "max_workers": limit,
+                "started": name in self._pools,
+                "active_tasks": self._active[name],
+            }
+            for name, limit in self.limits.items()
+        }
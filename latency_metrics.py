@@ -0,0 +1,138 @@
+# latency_metrics.py - Streaming latency histograms over rolling time windows
+import math
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+# Rolling windows reported by default, in seconds
+DEFAULT_WINDOWS = (60, 300, 900, 3600)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency counts (HDR-style)
+
+    Each bucket spans a factor of (1 + precision), so every reported
+    percentile is within `precision` of the true value, and the number of
+    buckets is bounded by the logarithm of the recorded range rather than by
+    the number of samples.
+    """
+
+    def __init__(self, precision: float = 0.01, min_value: float = 1e-4):
+        self.precision = precision
+        self.min_value = min_value
+        self._log_base = math.log1p(precision)
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base) + 1
+
+    def _bucket_value(self, bucket: int) -> float:
+        # Geometric midpoint of the bucket
+        if bucket == 0:
+            return self.min_value
+        return self.min_value * math.exp((bucket - 0.5) * self._log_base)
+
+    def record(self, seconds: float):
+        bucket = self._bucket(seconds)
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        for bucket, count in other._counts.items():
+            self._counts[bucket] = self._counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                return min(self._bucket_value(bucket), self.max)
+        return self.max
+
+
+class RollingLatency:
+    """Latency histograms kept per time slot, merged on demand into rolling windows"""
+
+    def __init__(self, horizon: float = 3600, slot_seconds: float = 60, precision: float = 0.01):
+        self.horizon = horizon
+        self.slot_seconds = slot_seconds
+        self.precision = precision
+        self._slots: deque = deque()
+
+    def _expire(self, now: float):
+        oldest = int((now - self.horizon) // self.slot_seconds)
+        while self._slots and self._slots[0][0] < oldest:
+            self._slots.popleft()
+
+    def record(self, seconds: float, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        slot = int(now // self.slot_seconds)
+        if not self._slots or self._slots[-1][0] != slot:
+            self._slots.append((slot, LatencyHistogram(self.precision)))
+            self._expire(now)
+        self._slots[-1][1].record(seconds)
+
+    def window(self, seconds: float, now: Optional[float] = None) -> LatencyHistogram:
+        """Merged histogram of the slots overlapping the last `seconds` (slot granularity)"""
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        first = int((now - seconds) // self.slot_seconds) + 1
+        merged = LatencyHistogram(self.precision)
+        for slot, histogram in self._slots:
+            if slot >= first:
+                merged.merge(histogram)
+        return merged
+
+    def summary(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        histogram = self.window(seconds, now)
+        return {
+            "count": histogram.count,
+            "per_minute": round(histogram.count * 60 / seconds, 3),
+            "mean": round(histogram.total / histogram.count, 4) if histogram.count else 0.0,
+            "p50": round(histogram.percentile(0.50), 4),
+            "p95": round(histogram.percentile(0.95), 4),
+            "p99": round(histogram.percentile(0.99), 4),
+            "max": round(histogram.max, 4),
+        }
+
+
+class LatencyMetrics:
+    """Named rolling latency series, e.g. one per agent stage plus end-to-end"""
+
+    def __init__(self, horizon: float = 3600, slot_seconds: float = 60):
+        self.horizon = horizon
+        self.slot_seconds = slot_seconds
+        self._series: Dict[str, RollingLatency] = {}
+
+    def record(self, name: str, seconds: float):
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = RollingLatency(self.horizon, self.slot_seconds)
+        series.record(seconds)
+
+    def summary(self, name: str, window: float) -> Dict[str, Any]:
+        series = self._series.get(name)
+        if series is None:
+            return RollingLatency(self.horizon, self.slot_seconds).summary(window)
+        return series.summary(window)
+
+    def report(self, windows: Iterable[float] = DEFAULT_WINDOWS) -> Dict[str, Dict[str, Any]]:
+        """Series name -> window label (e.g. "5m") -> summary, in seconds"""
+        windows = [window for window in windows if window <= self.horizon]
+        return {
+            name: {f"{int(window // 60)}m": series.summary(window) for window in windows}
+            for name, series in self._series.items()
+        }
@@ -0,0 +1,966 @@
+# repository.py - Pluggable async storage for applications, evaluations and agent status
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Type, get_args
+from urllib.parse import urlparse
+
+import pydantic_core
+from pydantic import BaseModel
+
+from agent_status import AgentStatusStore
+from application_index import ApplicationIndex
+from write_ahead_log import WriteAheadLog, blob, pack, unpack
+
+
+def lock_file(path: str):
+    """Exclusive lock on `path`, held until the returned file is closed; RuntimeError if taken"""
+    import fcntl  # POSIX only, like the deployment image
+
+    handle = open(path, "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        raise RuntimeError(f"{path} is locked by another process; run a single worker per database")
+    return handle
+
+
+class Repository:
+    """Async storage interface shared by every backend
+
+    Applications and evaluations are pydantic models; agent status is read back
+    as plain dicts keyed by agent name. `get_*` lookups return None (or omit the
+    id) on a miss rather than raising.
+    """
+
+    async def claim(self):
+        """Make this process the only server of the store, before `start`; RuntimeError if another is
+
+        The app keeps evaluation checkpoints, the queue and its indexes in the
+        serving process, so a second process on the same store would resume
+        and run the same evaluations and see a drifting copy of that state.
+        The claim is released by `close`.
+        """
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def save_applications(self, applications: List[BaseModel]):
+        raise NotImplementedError
+
+    async def save_application(self, application: BaseModel):
+        await self.save_applications([application])
+
+    async def set_application_status(self, app_id: str, status: str):
+        raise NotImplementedError
+
+    async def get_application(self, app_id: str) -> Optional[BaseModel]:
+        return (await self.get_applications([app_id])).get(app_id)
+
+    async def get_applications(self, app_ids: List[str]) -> Dict[str, BaseModel]:
+        raise NotImplementedError
+
+    async def list_applications(self) -> List[BaseModel]:
+        raise NotImplementedError
+
+    async def count_applications(self) -> int:
+        raise NotImplementedError
+
+    async def query_applications(
+        self,
+        status: Optional[str] = None,
+        funding_stage: Optional[str] = None,
+        recommendation: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[BaseModel]:
+        """Applications matching every given filter, ordered by (created_at, id)
+
+        Recommendation and score filters apply to the stored evaluation, so
+        they only match applications that have been evaluated. Ranges are
+        inclusive. `after` is the (created_at, id) keyset position of the last
+        application on the previous page.
+        """
+        raise NotImplementedError
+
+    async def iter_applications(self, batch_size: int = 1000, **filters) -> AsyncIterator[List[BaseModel]]:
+        """Every application matching `filters` (as for query_applications), one page at a time
+
+        Pages are read by keyset position, so memory stays bounded by
+        `batch_size` however many applications match.
+        """
+        after = None
+        while True:
+            page = await self.query_applications(after=after, limit=batch_size, **filters)
+            if page:
+                yield page
+            if len(page) < batch_size:
+                return
+            after = (page[-1].created_at, page[-1].id)
+
+    async def metric_counts(self) -> Dict[str, Any]:
+        """Totals plus per-status, per-funding-stage and per-recommendation counts"""
+        raise NotImplementedError
+
+    async def save_evaluations(self, evaluations: List[BaseModel]):
+        raise NotImplementedError
+
+    async def save_evaluation(self, evaluation: BaseModel):
+        await self.save_evaluations([evaluation])
+
+    async def get_evaluation(self, app_id: str) -> Optional[BaseModel]:
+        return (await self.get_evaluations([app_id])).get(app_id)
+
+    async def get_evaluations(self, app_ids: List[str]) -> Dict[str, BaseModel]:
+        raise NotImplementedError
+
+    async def list_evaluations(self) -> List[BaseModel]:
+        raise NotImplementedError
+
+    async def count_evaluations(self) -> int:
+        raise NotImplementedError
+
+    async def update_scores(self, scores: Iterable[Tuple[str, float, str, str]]):
+        """Apply (application_id, overall_score, recommendation, risk_level) rows"""
+        raise NotImplementedError
+
+    async def set_agent_status(self, app_id: str, agent: str, status: str, progress: int,
+                               reason: Optional[str] = None):
+        raise NotImplementedError
+
+    async def get_agent_status(self, app_id: str) -> Dict[str, Dict[str, Any]]:
+        """Agent name -> {agent, status, progress, reason} for every agent with an entry"""
+        return (await self.get_agent_statuses([app_id])).get(app_id, {})
+
+    async def get_agent_statuses(self, app_ids: List[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Agent status of each application that has any; ids without entries are omitted"""
+        raise NotImplementedError
+
+    async def finish_agent_status(self, app_id: str):
+        """Mark an application's agent status final, starting its retention period"""
+        raise NotImplementedError
+
+    async def evict_agent_status(self, finished_before: float) -> int:
+        """Drop agent status of applications finished before the given epoch time"""
+        raise NotImplementedError
+
+    async def save_setting(self, name: str, value: str):
+        """Store a named, JSON-encoded application setting, replacing any earlier value"""
+        raise NotImplementedError
+
+    async def get_setting(self, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+
+class MemoryRepository(Repository):
+    """Process-local dicts; the default for tests and single-worker deployments
+
+    Filtered queries are answered from an ApplicationIndex maintained on every
+    write, so the dicts must only be modified through this repository.
+    """
+
+    def __init__(self, applications: Dict[str, BaseModel], evaluations: Dict[str, BaseModel],
+                 agent_status: AgentStatusStore):
+        self.applications = applications
+        self.evaluations = evaluations
+        self.agent_status = agent_status
+        self.settings: Dict[str, str] = {}
+        self.index = ApplicationIndex()
+        self._build_index()
+
+    def _build_index(self):
+        values = {application.id: self._application_fields(application) for application in self.applications.values()}
+        for evaluation in self.evaluations.values():
+            values.setdefault(evaluation.application_id, {}).update(self._evaluation_fields(evaluation))
+        self.index.load(values)
+
+    @staticmethod
+    def _application_fields(application: BaseModel) -> Dict[str, Any]:
+        return {
+            "status": application.status,
+            "funding_stage": application.funding_stage,
+            "created_at": application.created_at.timestamp(),
+        }
+
+    @staticmethod
+    def _evaluation_fields(evaluation: BaseModel) -> Dict[str, Any]:
+        return {"recommendation": evaluation.recommendation, "overall_score": evaluation.overall_score}
+
+    async def save_applications(self, applications):
+        for application in applications:
+            self.applications[application.id] = application
+        self.index.update_many([(a.id, self._application_fields(a)) for a in applications])
+
+    async def set_application_status(self, app_id, status):
+        if app_id in self.applications:
+            self.applications[app_id].status = status
+            self.index.update(app_id, status=status)
+
+    async def get_applications(self, app_ids):
+        return {app_id: self.applications[app_id] for app_id in app_ids if app_id in self.applications}
+
+    async def list_applications(self):
+        return list(self.applications.values())
+
+    async def count_applications(self):
+        return len(self.applications)
+
+    async def query_applications(self, status=None, funding_stage=None, recommendation=None, min_score=None,
+                                 max_score=None, created_after=None, created_before=None, after=None, limit=None):
+        app_ids = self.index.query(
+            equals={"status": status, "funding_stage": funding_stage, "recommendation": recommendation},
+            ranges={
+                "overall_score": (min_score, max_score),
+                "created_at": (
+                    created_after.timestamp() if created_after else None,
+                    created_before.timestamp() if created_before else None,
+                ),
+            },
+            after=(after[0].timestamp(), after[1]) if after else None,
+            limit=limit,
+        )
+        # Evaluation-only ids (no stored application) can't be listed
+        return [self.applications[app_id] for app_id in app_ids if app_id in self.applications]
+
+    async def metric_counts(self):
+        # Read straight off the index's hash sets, which every write keeps current
+        return {
+            "applications": len(self.applications),
+            "evaluations": len(self.evaluations),
+            "by_status": self.index.counts("status"),
+            "by_funding_stage": self.index.counts("funding_stage"),
+            "by_recommendation": self.index.counts("recommendation"),
+        }
+
+    async def save_evaluations(self, evaluations):
+        for evaluation in evaluations:
+            self.evaluations[evaluation.application_id] = evaluation
+        self.index.update_many([(e.application_id, self._evaluation_fields(e)) for e in evaluations])
+
+    async def get_evaluations(self, app_ids):
+        return {app_id: self.evaluations[app_id] for app_id in app_ids if app_id in self.evaluations}
+
+    async def list_evaluations(self):
+        return list(self.evaluations.values())
+
+    async def count_evaluations(self):
+        return len(self.evaluations)
+
+    async def update_scores(self, scores):
+        updates = []
+        for app_id, overall_score, recommendation, risk_level in scores:
+            # Values are computed by the caller, so skip pydantic's per-attribute assignment path
+            self.evaluations[app_id].__dict__.update(
+                overall_score=overall_score,
+                recommendation=recommendation,
+                risk_level=risk_level
+            )
+            updates.append((app_id, {"recommendation": recommendation, "overall_score": overall_score}))
+        self.index.update_many(updates)
+
+    async def set_agent_status(self, app_id, agent, status, progress, reason=None):
+        self.agent_status.set(app_id, agent, status, progress, reason)
+
+    async def get_agent_statuses(self, app_ids):
+        statuses = {}
+        for app_id in app_ids:
+            status = self.agent_status.get(app_id)
+            if status:
+                statuses[app_id] = status
+        return statuses
+
+    async def finish_agent_status(self, app_id):
+        self.agent_status.finish(app_id)
+
+    async def evict_agent_status(self, finished_before):
+        return self.agent_status.evict(finished_before)
+
+    async def save_setting(self, name, value):
+        self.settings[name] = value
+
+    async def get_setting(self, name):
+        return self.settings.get(name)
+
+
+# Record types in the DurableMemoryRepository write-ahead log
+(WAL_SAVE_APPLICATION, WAL_SET_APPLICATION_STATUS, WAL_SAVE_EVALUATION, WAL_UPDATE_SCORE,
+ WAL_SET_AGENT_STATUS, WAL_FINISH_AGENT_STATUS, WAL_EVICT_AGENT_STATUS) = range(1, 8)
+# Snapshot-only records holding a chunk of models as one JSON object of columns
+WAL_SNAPSHOT_APPLICATIONS, WAL_SNAPSHOT_EVALUATIONS = 8, 9
+WAL_SAVE_SETTING = 10
+SNAPSHOT_CHUNK = 10000
+
+
+class ColumnCodec:
+    """Chunks of one model type as {field: [values...]} JSON, loaded without re-validation
+
+    The models were validated when first saved, so loading only parses the
+    JSON, restores datetimes and builds instances directly, which is several
+    times cheaper than validating a document per model. Chunks whose fields
+    don't match the current model (written before a schema change) are
+    validated row by row instead.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.fields = tuple(model.model_fields)
+        self.datetime_fields = tuple(
+            name for name, field in model.model_fields.items()
+            if field.annotation is datetime or datetime in get_args(field.annotation)
+        )
+
+    def encode(self, models: List[BaseModel]) -> bytes:
+        return pydantic_core.to_json({name: [model.__dict__[name] for model in models] for name in self.fields})
+
+    def decode(self, data: bytes) -> List[BaseModel]:
+        columns = json.loads(data)
+        names = tuple(columns)
+        if set(names) != set(self.fields):
+            return [self.model.model_validate(dict(zip(names, row))) for row in zip(*columns.values())]
+        for name in self.datetime_fields:
+            columns[name] = [None if value is None else datetime.fromisoformat(value) for value in columns[name]]
+        rows = zip(*columns.values())
+
+        # What model_construct does, minus its per-field default handling. Every
+        # field is set, so the instances can share one fields-set (assignments
+        # only ever add names already in it).
+        model, fields_set = self.model, set(names)
+        new, setattr_ = object.__new__, object.__setattr__
+        models = []
+        for row in rows:
+            instance = new(model)
+            setattr_(instance, "__dict__", dict(zip(names, row)))
+            setattr_(instance, "__pydantic_fields_set__", fields_set)
+            setattr_(instance, "__pydantic_extra__", None)
+            setattr_(instance, "__pydantic_private__", None)
+            models.append(instance)
+        return models
+
+
+class DurableMemoryRepository(MemoryRepository):
+    """MemoryRepository whose every change is also appended to a write-ahead log
+
+    Writes update the dicts first and then await the log's group commit, so
+    a write that returned survives a crash. `start` rebuilds the stores from
+    the newest compacted snapshot plus the log tail written after it.
+    """
+
+    def __init__(self, directory: str, application_model: Type[BaseModel], evaluation_model: Type[BaseModel],
+                 applications: Dict[str, BaseModel], evaluations: Dict[str, BaseModel],
+                 agent_status: AgentStatusStore, fsync: bool = True, snapshot_bytes: int = 64 << 20):
+        super().__init__(applications, evaluations, agent_status)
+        self.application_model = application_model
+        self.evaluation_model = evaluation_model
+        self._application_columns = ColumnCodec(application_model)
+        self._evaluation_columns = ColumnCodec(evaluation_model)
+        self.log = WriteAheadLog(directory, fsync=fsync, snapshot_bytes=snapshot_bytes,
+                                 snapshot_source=self._snapshot_records)
+        self._owner_lock = None
+
+    async def claim(self):
+        self._owner_lock = lock_file(os.path.join(self.log.directory, "owner.lock"))
+
+    async def start(self):
+        started = time.perf_counter()
+        replayed = 0
+        for op, payload in self.log.recover():
+            self._replay(op, payload)
+            replayed += 1
+        self._build_index()
+        await self.log.start()
+        if replayed:
+            print(f"Recovered {len(self.applications)} applications from {replayed} log records "
+                  f"in {time.perf_counter() - started:.1f}s")
+
+    async def close(self):
+        await self.log.close()
+        if self._owner_lock is not None:
+            self._owner_lock.close()
+            self._owner_lock = None
+
+    def _replay(self, op: int, payload: bytes):
+        if op == WAL_SNAPSHOT_APPLICATIONS:
+            for application in self._application_columns.decode(blob(payload)):
+                self.applications[application.id] = application
+            return
+        if op == WAL_SNAPSHOT_EVALUATIONS:
+            for evaluation in self._evaluation_columns.decode(blob(payload)):
+                self.evaluations[evaluation.application_id] = evaluation
+            return
+        # Saves dominate the log tail, so their single JSON field is sliced out directly
+        if op == WAL_SAVE_APPLICATION:
+            application = self.application_model.model_validate_json(blob(payload))
+            self.applications[application.id] = application
+            return
+        if op == WAL_SAVE_EVALUATION:
+            evaluation = self.evaluation_model.model_validate_json(blob(payload))
+            self.evaluations[evaluation.application_id] = evaluation
+            return
+        values = unpack(payload)
+        if op == WAL_SET_APPLICATION_STATUS:
+            if values[0] in self.applications:
+                self.applications[values[0]].status = values[1]
+        elif op == WAL_UPDATE_SCORE:
+            if values[0] in self.evaluations:
+                self.evaluations[values[0]].__dict__.update(
+                    overall_score=values[1], recommendation=values[2], risk_level=values[3]
+                )
+        elif op == WAL_SET_AGENT_STATUS:
+            self.agent_status.set(*values)
+        elif op == WAL_FINISH_AGENT_STATUS:
+            self.agent_status.finish(*values)
+        elif op == WAL_EVICT_AGENT_STATUS:
+            self.agent_status.evict(values[0])
+        elif op == WAL_SAVE_SETTING:
+            self.settings[values[0]] = values[1]
+
+    def _snapshot_records(self):
+        # Only references are captured here, on the event loop; serialising
+        # happens in the log's worker thread as the records are consumed
+        applications = list(self.applications.values())
+        evaluations = list(self.evaluations.values())
+        agent_entries, finished = self.agent_status.export()
+        settings = list(self.settings.items())
+
+        def records():
+            for start in range(0, len(applications), SNAPSHOT_CHUNK):
+                chunk = applications[start:start + SNAPSHOT_CHUNK]
+                yield WAL_SNAPSHOT_APPLICATIONS, pack(self._application_columns.encode(chunk))
+            for start in range(0, len(evaluations), SNAPSHOT_CHUNK):
+                chunk = evaluations[start:start + SNAPSHOT_CHUNK]
+                yield WAL_SNAPSHOT_EVALUATIONS, pack(self._evaluation_columns.encode(chunk))
+            for entry in agent_entries:
+                yield WAL_SET_AGENT_STATUS, pack(*entry)
+            for app_id, finished_at in finished:
+                yield WAL_FINISH_AGENT_STATUS, pack(app_id, finished_at)
+            for name, value in settings:
+                yield WAL_SAVE_SETTING, pack(name, value)
+
+        return records()
+
+    # Each write encodes its records before changing the stores, so a value
+    # that can't be logged leaves memory and the log in agreement
+
+    async def save_applications(self, applications):
+        records = [(WAL_SAVE_APPLICATION, pack(a.model_dump_json().encode())) for a in applications]
+        await super().save_applications(applications)
+        await self.log.append(records)
+
+    async def set_application_status(self, app_id, status):
+        records = [(WAL_SET_APPLICATION_STATUS, pack(app_id, status))]
+        await super().set_application_status(app_id, status)
+        await self.log.append(records)
+
+    async def save_evaluations(self, evaluations):
+        records = [(WAL_SAVE_EVALUATION, pack(e.model_dump_json().encode())) for e in evaluations]
+        await super().save_evaluations(evaluations)
+        await self.log.append(records)
+
+    async def update_scores(self, scores):
+        scores = list(scores)
+        records = [
+            (WAL_UPDATE_SCORE, pack(app_id, overall_score, recommendation, risk_level))
+            for app_id, overall_score, recommendation, risk_level in scores
+        ]
+        await super().update_scores(scores)
+        await self.log.append(records)
+
+    async def set_agent_status(self, app_id, agent, status, progress, reason=None):
+        records = [(WAL_SET_AGENT_STATUS, pack(app_id, agent, status, progress, reason))]
+        await super().set_agent_status(app_id, agent, status, progress, reason)
+        await self.log.append(records)
+
+    async def finish_agent_status(self, app_id):
+        finished_at = time.time()
+        records = [(WAL_FINISH_AGENT_STATUS, pack(app_id, finished_at))]
+        self.agent_status.finish(app_id, finished_at)
+        await self.log.append(records)
+
+    async def evict_agent_status(self, finished_before):
+        evicted = await super().evict_agent_status(finished_before)
+        if evicted:
+            await self.log.append([(WAL_EVICT_AGENT_STATUS, pack(finished_before))])
+        return evicted
+
+    async def save_setting(self, name, value):
+        records = [(WAL_SAVE_SETTING, pack(name, value))]
+        await super().save_setting(name, value)
+        await self.log.append(records)
+
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS applications (
+        id TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL,
+        status TEXT NOT NULL,
+        funding_stage TEXT NOT NULL,
+        data TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS evaluations (
+        application_id TEXT PRIMARY KEY,
+        overall_score DOUBLE PRECISION NOT NULL,
+        recommendation TEXT NOT NULL,
+        risk_level TEXT NOT NULL,
+        data TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS agent_status (
+        application_id TEXT NOT NULL,
+        agent TEXT NOT NULL,
+        status TEXT NOT NULL,
+        progress INTEGER NOT NULL,
+        reason TEXT,
+        finished_at DOUBLE PRECISION,
+        PRIMARY KEY (application_id, agent)
+    )""",
+    """CREATE TABLE IF NOT EXISTS settings (
+        name TEXT PRIMARY KEY,
+        data TEXT NOT NULL
+    )""",
+    # Secondary indexes behind query_applications
+    "CREATE INDEX IF NOT EXISTS applications_status ON applications (status)",
+    "CREATE INDEX IF NOT EXISTS applications_funding_stage ON applications (funding_stage)",
+    "CREATE INDEX IF NOT EXISTS applications_created ON applications (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS evaluations_recommendation ON evaluations (recommendation)",
+    "CREATE INDEX IF NOT EXISTS evaluations_overall_score ON evaluations (overall_score)",
+    "CREATE INDEX IF NOT EXISTS agent_status_finished ON agent_status (finished_at)",
+]
+
+UPSERT_APPLICATION = """
+    INSERT INTO applications (id, created_at, status, funding_stage, data) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET created_at = excluded.created_at, status = excluded.status,
+        funding_stage = excluded.funding_stage, data = excluded.data
+"""
+UPDATE_APPLICATION_STATUS = "UPDATE applications SET status = ? WHERE id = ?"
+UPSERT_EVALUATION = """
+    INSERT INTO evaluations (application_id, overall_score, recommendation, risk_level, data) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (application_id) DO UPDATE SET overall_score = excluded.overall_score,
+        recommendation = excluded.recommendation, risk_level = excluded.risk_level, data = excluded.data
+"""
+UPDATE_SCORES = "UPDATE evaluations SET overall_score = ?, recommendation = ?, risk_level = ? WHERE application_id = ?"
+UPSERT_AGENT_STATUS = """
+    INSERT INTO agent_status (application_id, agent, status, progress, reason, finished_at) VALUES (?, ?, ?, ?, ?, NULL)
+    ON CONFLICT (application_id, agent) DO UPDATE SET status = excluded.status,
+        progress = excluded.progress, reason = excluded.reason, finished_at = NULL
+"""
+FINISH_AGENT_STATUS = "UPDATE agent_status SET finished_at = ? WHERE application_id = ?"
+EVICT_AGENT_STATUS = "DELETE FROM agent_status WHERE finished_at < ?"
+UPSERT_SETTING = """
+    INSERT INTO settings (name, data) VALUES (?, ?)
+    ON CONFLICT (name) DO UPDATE SET data = excluded.data
+"""
+SELECT_APPLICATIONS = "SELECT status, data FROM applications"
+SELECT_EVALUATIONS = "SELECT overall_score, recommendation, risk_level, data FROM evaluations"
+
+
+class SQLRepository(Repository):
+    """Shared SQL backend logic with group-committed writes
+
+    Writes are buffered for up to `flush_interval` seconds (or `max_batch_size`
+    statements) and committed together in one transaction; each caller awaits
+    the commit, so reads after a write always see it. Statements are fixed
+    strings, so drivers reuse their prepared form on every pooled connection.
+    """
+
+    placeholder = "?"
+
+    def __init__(self, application_model: Type[BaseModel], evaluation_model: Type[BaseModel],
+                 flush_interval: float = 0.005, max_batch_size: int = 1000, metrics_max_age: float = 5.0):
+        self.application_model = application_model
+        self.evaluation_model = evaluation_model
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.metrics_max_age = metrics_max_age
+        self._metrics: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._metrics_lock: Optional[asyncio.Lock] = None
+        self._pending: List[Tuple[str, List[tuple], asyncio.Future]] = []
+        self._pending_rows = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    def _sql(self, statement: str) -> str:
+        if self.placeholder == "?":
+            return statement
+        counter = iter(range(1, statement.count("?") + 1))
+        return re.sub(r"\?", lambda _: f"${next(counter)}", statement)
+
+    async def _fetch(self, sql: str, params: tuple = ()) -> List[tuple]:
+        raise NotImplementedError
+
+    async def _commit(self, batch: List[Tuple[str, List[tuple]]]):
+        raise NotImplementedError
+
+    async def start(self):
+        self._metrics_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        await self._flush()
+
+    async def _write(self, statement: str, rows: List[tuple]):
+        if not rows:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((self._sql(statement), rows, future))
+        self._pending_rows += len(rows)
+        self._wakeup.set()
+        await future
+
+    async def _write_loop(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self._pending_rows < self.max_batch_size:
+                # Give concurrent writers a moment to join this commit
+                await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        self._pending_rows = 0
+        if not batch:
+            return
+        try:
+            await self._commit([(statement, rows) for statement, rows, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    def _load_application(self, status: str, data: str) -> BaseModel:
+        application = self.application_model.model_validate_json(data)
+        application.status = status
+        return application
+
+    def _load_evaluation(self, overall_score: float, recommendation: str, risk_level: str, data: str) -> BaseModel:
+        evaluation = self.evaluation_model.model_validate_json(data)
+        evaluation.__dict__.update(overall_score=overall_score, recommendation=recommendation, risk_level=risk_level)
+        return evaluation
+
+    @staticmethod
+    def _stored_time(value: Optional[datetime]) -> Optional[str]:
+        # created_at is stored as naive local ISO text; compare like with like
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value.isoformat()
+
+    def _in_clause(self, values: List[str]) -> str:
+        return ", ".join("?" for _ in values)
+
+    async def save_applications(self, applications):
+        await self._write(UPSERT_APPLICATION, [
+            (a.id, a.created_at.isoformat(), a.status, a.funding_stage, a.model_dump_json())
+            for a in applications
+        ])
+
+    async def set_application_status(self, app_id, status):
+        await self._write(UPDATE_APPLICATION_STATUS, [(status, app_id)])
+
+    async def get_applications(self, app_ids):
+        if not app_ids:
+            return {}
+        rows = await self._fetch(
+            self._sql(f"{SELECT_APPLICATIONS} WHERE id IN ({self._in_clause(app_ids)})"),
+            tuple(app_ids)
+        )
+        applications = [self._load_application(*row) for row in rows]
+        return {application.id: application for application in applications}
+
+    async def list_applications(self):
+        rows = await self._fetch(SELECT_APPLICATIONS + " ORDER BY created_at, id")
+        return [self._load_application(*row) for row in rows]
+
+    async def count_applications(self):
+        return (await self._fetch("SELECT COUNT(*) FROM applications"))[0][0]
+
+    async def query_applications(self, status=None, funding_stage=None, recommendation=None, min_score=None,
+                                 max_score=None, created_after=None, created_before=None, after=None, limit=None):
+        clauses, params = [], []
+        if after is not None:
+            clauses.append("(a.created_at, a.id) > (?, ?)")
+            params.extend((self._stored_time(after[0]), after[1]))
+        for clause, value in (
+            ("a.status = ?", status),
+            ("a.funding_stage = ?", funding_stage),
+            ("a.created_at >= ?", self._stored_time(created_after)),
+            ("a.created_at <= ?", self._stored_time(created_before)),
+            ("e.recommendation = ?", recommendation),
+            ("e.overall_score >= ?", min_score),
+            ("e.overall_score <= ?", max_score),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        sql = "SELECT a.status, a.data FROM applications a"
+        if any(clause.startswith("e.") for clause in clauses):
+            sql += " JOIN evaluations e ON e.application_id = a.id"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY a.created_at, a.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = await self._fetch(self._sql(sql), tuple(params))
+        return [self._load_application(*row) for row in rows]
+
+    async def metric_counts(self):
+        # Other processes write to the same database, so counters can't be kept
+        # in memory here; serve a snapshot at most `metrics_max_age` seconds old
+        async with self._metrics_lock:
+            if self._metrics is None or time.monotonic() - self._metrics[0] > self.metrics_max_age:
+                grouped = {}
+                for name, sql in (
+                    ("by_status", "SELECT status, COUNT(*) FROM applications GROUP BY status"),
+                    ("by_funding_stage", "SELECT funding_stage, COUNT(*) FROM applications GROUP BY funding_stage"),
+                    ("by_recommendation", "SELECT recommendation, COUNT(*) FROM evaluations GROUP BY recommendation"),
+                ):
+                    grouped[name] = {value: count for value, count in await self._fetch(sql)}
+                self._metrics = (time.monotonic(), {
+                    "applications": sum(grouped["by_status"].values()),
+                    "evaluations": sum(grouped["by_recommendation"].values()),
+                    **grouped,
+                })
+            return self._metrics[1]
+
+    async def save_evaluations(self, evaluations):
+        await self._write(UPSERT_EVALUATION, [
+            (e.application_id, e.overall_score, e.recommendation, e.risk_level, e.model_dump_json())
+            for e in evaluations
+        ])
+
+    async def get_evaluations(self, app_ids):
+        if not app_ids:
+            return {}
+        rows = await self._fetch(
+            self._sql(f"{SELECT_EVALUATIONS} WHERE application_id IN ({self._in_clause(app_ids)})"),
+            tuple(app_ids)
+        )
+        evaluations = [self._load_evaluation(*row) for row in rows]
+        return {evaluation.application_id: evaluation for evaluation in evaluations}
+
+    async def list_evaluations(self):
+        rows = await self._fetch(SELECT_EVALUATIONS)
+        return [self._load_evaluation(*row) for row in rows]
+
+    async def count_evaluations(self):
+        return (await self._fetch("SELECT COUNT(*) FROM evaluations"))[0][0]
+
+    async def update_scores(self, scores):
+        await self._write(UPDATE_SCORES, [
+            (overall_score, recommendation, risk_level, app_id)
+            for app_id, overall_score, recommendation, risk_level in scores
+        ])
+
+    async def set_agent_status(self, app_id, agent, status, progress, reason=None):
+        await self._write(UPSERT_AGENT_STATUS, [(app_id, agent, status, progress, reason)])
+
+    async def get_agent_statuses(self, app_ids):
+        if not app_ids:
+            return {}
+        rows = await self._fetch(
+            self._sql(
+                "SELECT application_id, agent, status, progress, reason FROM agent_status "
+                f"WHERE application_id IN ({self._in_clause(app_ids)})"
+            ),
+            tuple(app_ids)
+        )
+        statuses = {}
+        for app_id, agent, status, progress, reason in rows:
+            statuses.setdefault(app_id, {})[agent] = {
+                "agent": agent, "status": status, "progress": progress, "reason": reason
+            }
+        return statuses
+
+    async def finish_agent_status(self, app_id):
+        await self._write(FINISH_AGENT_STATUS, [(time.time(), app_id)])
+
+    async def evict_agent_status(self, finished_before):
+        expired = (await self._fetch(
+            self._sql("SELECT COUNT(DISTINCT application_id) FROM agent_status WHERE finished_at < ?"), (finished_before,)
+        ))[0][0]
+        if expired:
+            await self._write(EVICT_AGENT_STATUS, [(finished_before,)])
+        return expired
+
+    async def save_setting(self, name, value):
+        await self._write(UPSERT_SETTING, [(name, value)])
+
+    async def get_setting(self, name):
+        rows = await self._fetch(self._sql("SELECT data FROM settings WHERE name = ?"), (name,))
+        return rows[0][0] if rows else None
+
+
+class SQLiteRepository(SQLRepository):
+    """SQLite in WAL mode behind a small pool of connections served by worker threads"""
+
+    def __init__(self, path: str, application_model: Type[BaseModel], evaluation_model: Type[BaseModel],
+                 pool_size: int = 4, **kwargs):
+        super().__init__(application_model, evaluation_model, **kwargs)
+        self.path = path
+        self.pool_size = pool_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connections: Optional[asyncio.Queue] = None
+        self._owner_lock = None
+
+    async def claim(self):
+        self._owner_lock = lock_file(f"{self.path}.lock")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    async def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="sqlite")
+        self._connections = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        for _ in range(self.pool_size):
+            self._connections.put_nowait(await loop.run_in_executor(self._executor, self._connect))
+
+        def create_schema(conn):
+            with conn:
+                for statement in SCHEMA:
+                    conn.execute(statement)
+        await self._run(create_schema)
+        await super().start()
+
+    async def close(self):
+        await super().close()
+        if self._connections is not None:
+            while not self._connections.empty():
+                self._connections.get_nowait().close()
+            self._connections = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owner_lock is not None:
+            self._owner_lock.close()
+            self._owner_lock = None
+
+    async def _run(self, fn):
+        conn = await self._connections.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, conn)
+        finally:
+            self._connections.put_nowait(conn)
+
+    async def _fetch(self, sql, params=()):
+        return await self._run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def _commit(self, batch):
+        def commit(conn):
+            with conn:
+                for statement, rows in batch:
+                    conn.executemany(statement, rows)
+        await self._run(commit)
+
+
+# pg_advisory_lock key taken by the process serving a Postgres database
+OWNER_LOCK_KEY = 0x5354415254555041
+
+
+class PostgresRepository(SQLRepository):
+    """asyncpg connection pool; asyncpg prepares and caches each statement per connection"""
+
+    placeholder = "$"
+
+    def __init__(self, dsn: str, application_model: Type[BaseModel], evaluation_model: Type[BaseModel],
+                 min_pool_size: int = 2, max_pool_size: int = 10, **kwargs):
+        super().__init__(application_model, evaluation_model, **kwargs)
+        self.dsn = dsn
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self._pool = None
+        self._owner = None
+
+    async def claim(self):
+        import asyncpg
+
+        # Session-level advisory locks last as long as the connection holding them
+        conn = await asyncpg.connect(self.dsn)
+        if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", OWNER_LOCK_KEY):
+            await conn.close()
+            raise RuntimeError("Database is claimed by another process; run a single worker per database")
+        self._owner = conn
+
+    async def start(self):
+        import asyncpg  # optional dependency, only needed for Postgres deployments
+
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=self.min_pool_size, max_size=self.max_pool_size)
+        async with self._pool.acquire() as conn:
+            for statement in SCHEMA:
+                await conn.execute(statement)
+        await super().start()
+
+    async def close(self):
+        await super().close()
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        if self._owner is not None:
+            await self._owner.close()
+            self._owner = None
+
+    async def _fetch(self, sql, params=()):
+        async with self._pool.acquire() as conn:
+            return [tuple(row) for row in await conn.fetch(sql, *params)]
+
+    async def _commit(self, batch):
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                for statement, rows in batch:
+                    await conn.executemany(statement, rows)
+
+
+def create_repository(url: str, application_model: Type[BaseModel], evaluation_model: Type[BaseModel],
+                      memory_stores: Optional[Tuple[dict, dict, AgentStatusStore]] = None) -> Repository:
+    """Build a backend from a URL: memory://, memory:///path/to/wal, sqlite:///path/to.db or postgresql://..."""
+    scheme = urlparse(url).scheme
+    metrics_max_age = float(os.getenv("DASHBOARD_METRICS_MAX_AGE", "5"))
+    if scheme == "memory":
+        stores = memory_stores or ({}, {}, AgentStatusStore())
+        directory = url[len("memory:///"):] if url.startswith("memory:///") else ""
+        if not directory:
+            return MemoryRepository(*stores)
+        return DurableMemoryRepository(
+            directory, application_model, evaluation_model, *stores,
+            fsync=os.getenv("WAL_FSYNC", "1") != "0",
+            snapshot_bytes=int(float(os.getenv("WAL_SNAPSHOT_MB", "64")) * (1 << 20))
+        )
+    if scheme == "sqlite":
+        path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url[len("sqlite://"):]
+        if not path or path == ":memory:":
+            # Every pooled connection would get its own private in-memory database
+            raise ValueError("SQLite repository needs a file path, e.g. sqlite:///data/startup_analyst.db")
+        return SQLiteRepository(path, application_model, evaluation_model,
+                                pool_size=int(os.getenv("DATABASE_POOL_SIZE", "4")), metrics_max_age=metrics_max_age)
+    if scheme in ("postgres", "postgresql"):
+        return PostgresRepository(url, application_model, evaluation_model,
+                                  max_pool_size=int(os.getenv("DATABASE_POOL_SIZE", "10")), metrics_max_age=metrics_max_age)
+    raise ValueError(f"Unsupported repository URL scheme '{scheme}'")
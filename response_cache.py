@@ -0,0 +1,118 @@
+# response_cache.py - Resource versions for ETags and a bounded cache of encoded response bodies
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class ResponseCache:
+    """Version counters per resource and per kind, plus an LRU of JSON bodies
+
+    Every mutation of a resource must be reported through `invalidate` (or
+    `invalidate_all` for a whole kind); that bumps its version and drops its
+    cached body. ETags are derived from the versions alone, so a matching
+    If-None-Match can be answered without loading or serialising anything.
+    Tags embed a per-process epoch, so tags handed out before a restart
+    never match.
+
+    Versions live in this process only, so they track a repository only when
+    every write to it goes through this process. Otherwise - a database other
+    processes also write - create it with `enabled=False`: no ETags are issued
+    and no bodies are kept.
+    """
+
+    def __init__(self, max_entries: int = 10000, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._epoch = uuid.uuid4().hex[:8]
+        self._sequence = 0
+        self._versions: Dict[Tuple[str, str], int] = {}
+        # Bumped by invalidate_all only, so it can cover every id of a kind at once
+        self._generations: Dict[str, int] = {}
+        # Bumped by any change to a kind, for listings
+        self._changes: Dict[str, int] = {}
+        self._bodies: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _next(self) -> int:
+        self._sequence += 1
+        return self._sequence
+
+    def invalidate(self, kind: str, ids: Iterable[str]):
+        if not self.enabled:
+            return
+        version = self._next()
+        for resource_id in ids:
+            self._versions[(kind, resource_id)] = version
+            self._bodies.pop((kind, resource_id), None)
+        self._changes[kind] = version
+
+    def invalidate_all(self, kind: str):
+        if not self.enabled:
+            return
+        self._generations[kind] = self._changes[kind] = self._next()
+        for key in [key for key in self._bodies if key[0] == kind]:
+            del self._bodies[key]
+
+    def etag(self, kind: str, resource_id: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        version = self._versions.get((kind, resource_id), 0)
+        return f'"{self._epoch}-{kind}-{self._generations.get(kind, 0)}-{version}"'
+
+    def collection_etag(self, kinds: Iterable[str], variant: str = "") -> Optional[str]:
+        """Tag for a listing over the given kinds; changes whenever any resource of them does"""
+        if not self.enabled:
+            return None
+        changes = ".".join(str(self._changes.get(kind, 0)) for kind in kinds)
+        return f'"{self._epoch}-list-{changes}-{zlib.crc32(variant.encode()):08x}"'
+
+    def get(self, kind: str, resource_id: str) -> Optional[bytes]:
+        """Cached body, only if it was stored under the current ETag"""
+        if not self.enabled:
+            return None
+        key = (kind, resource_id)
+        entry = self._bodies.get(key)
+        if entry is None or entry[0] != self.etag(kind, resource_id):
+            self.misses += 1
+            return None
+        self._bodies.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, kind: str, resource_id: str, etag: Optional[str], body: bytes):
+        """Store a body encoded for `etag`, taken before the resource was loaded"""
+        if etag is None or etag != self.etag(kind, resource_id):
+            # Changed while it was being loaded
+            return
+        key = (kind, resource_id)
+        self._bodies[key] = (etag, body)
+        self._bodies.move_to_end(key)
+        while len(self._bodies) > self.max_entries:
+            self._bodies.popitem(last=False)
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._bodies),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "tracked_versions": len(self._versions),
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str], exists: bool = False) -> bool:
+    """Whether an If-None-Match header value covers the given tag
+
+    `*` matches any current representation, so it only counts when the caller
+    passes `exists` after finding the resource; before that, tags alone are
+    compared.
+    """
+    if not if_none_match or etag is None:
+        return False
+    if if_none_match.strip() == "*":
+        return exists
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
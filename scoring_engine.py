@@ -0,0 +1,97 @@
+# scoring_engine.py - Vectorized portfolio scoring over contiguous sub-score arrays
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Score thresholds shared with the per-evaluation scoring path
+INVEST_THRESHOLD = 7.5
+REVIEW_THRESHOLD = 6.0
+LOW_RISK_THRESHOLD = 8.0
+MEDIUM_RISK_THRESHOLD = 6.5
+
+# Codes produced by PortfolioScores.rescore index into these labels
+RECOMMENDATIONS = np.array(["PASS", "REVIEW", "INVEST"])
+RISK_LEVELS = np.array(["HIGH", "MEDIUM", "LOW"])
+
+
+class PortfolioScores:
+    """Sub-scores of every evaluated application in a (4, n) float64 array
+
+    Each row is one contiguous sub-score - founder-market fit, market
+    opportunity, business model and traction - matching the order of the
+    investor weight vector.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._scores = np.empty((4, capacity), dtype=np.float64)
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, app_id: str) -> bool:
+        return app_id in self._positions
+
+    @property
+    def ids(self) -> List[str]:
+        return self._ids
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self._scores[:, :len(self._ids)]
+
+    def upsert(self, app_id: str, founder_market_fit: float, market_opportunity: float,
+               business_model: float, traction: float):
+        position = self._positions.get(app_id)
+        if position is None:
+            position = len(self._ids)
+            if position == self._scores.shape[1]:
+                grown = np.empty((4, max(2 * position, 1024)), dtype=np.float64)
+                grown[:, :position] = self._scores[:, :position]
+                self._scores = grown
+            self._ids.append(app_id)
+            self._positions[app_id] = position
+        self._scores[:, position] = (founder_market_fit, market_opportunity, business_model, traction)
+
+    def remove(self, app_id: str):
+        # Move the last column into the hole so the array stays contiguous
+        position = self._positions.pop(app_id)
+        last = len(self._ids) - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._scores[:, position] = self._scores[:, last]
+            self._ids[position] = moved_id
+            self._positions[moved_id] = position
+        self._ids.pop()
+
+    def rescore(self, weights: Sequence[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Overall scores, recommendation codes and risk codes for the whole portfolio"""
+        # Weights are applied as given (normalise them first) and summed in the
+        # same order as the per-evaluation path, so scores sitting exactly on a
+        # threshold classify identically
+        founder_w, market_w, business_model_w, traction_w = weights
+        founder, market, business_model, traction = self.scores
+        overall = founder * founder_w + market * market_w + business_model * business_model_w + traction * traction_w
+        recommendation_codes = (overall >= REVIEW_THRESHOLD).astype(np.int8) + (overall >= INVEST_THRESHOLD)
+        risk_codes = (overall >= MEDIUM_RISK_THRESHOLD).astype(np.int8) + (overall >= LOW_RISK_THRESHOLD)
+        return overall, recommendation_codes, risk_codes
+
+    def ranked(self, weights: Sequence[float], limit: int) -> List[Dict[str, object]]:
+        """Top `limit` applications by overall score under the given weights"""
+        overall, recommendation_codes, risk_codes = self.rescore(weights)
+        limit = min(limit, len(overall))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-overall, limit - 1)[:limit]
+        top = top[np.argsort(-overall[top], kind="stable")]
+        return [
+            {
+                "rank": rank,
+                "application_id": self._ids[position],
+                "overall_score": float(overall[position]),
+                "recommendation": str(RECOMMENDATIONS[recommendation_codes[position]]),
+                "risk_level": str(RISK_LEVELS[risk_codes[position]]),
+            }
+            for rank, position in enumerate(top.tolist(), start=1)
+        ]
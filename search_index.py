@@ -0,0 +1,145 @@
+# search_index.py - Incremental BM25 full-text index over applications and evaluations
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric tokens without stopwords; a trailing plural 's' is dropped"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class SearchIndex:
+    """BM25 over an inverted index whose postings are append-only typed arrays
+
+    Each (re)indexed document gets a fresh ordinal and its previous ordinal is
+    tombstoned, so updates never rewrite postings; tombstones are dropped by
+    compaction once they outnumber live documents. Queries score every posting
+    of each query term in one vectorized pass, so latency follows the
+    postings length of the query terms rather than the number of documents.
+    """
+
+    def __init__(self, field_weights: Dict[str, int], k1: float = 1.2, b: float = 0.75):
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._ordinals: Dict[str, int] = {}
+        self._doc_ids: List[Optional[str]] = []
+        self._lengths = array("f")
+        self._alive = bytearray()
+        self._live_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def _terms(self, fields: Dict[str, Union[str, Iterable[str], None]]) -> Counter:
+        terms = Counter()
+        for field, weight in self.field_weights.items():
+            value = fields.get(field)
+            if not value:
+                continue
+            text = value if isinstance(value, str) else " ".join(value)
+            for token in tokenize(text):
+                terms[token] += weight
+        return terms
+
+    def add(self, doc_id: str, fields: Dict[str, Union[str, Iterable[str], None]]):
+        """Index (or re-index) a document from its field values"""
+        self.remove(doc_id)
+        terms = self._terms(fields)
+        ordinal = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._ordinals[doc_id] = ordinal
+        length = float(sum(terms.values()))
+        self._lengths.append(length)
+        self._alive.append(1)
+        self._live_length += length
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("i"), array("f"))
+            postings[0].append(ordinal)
+            postings[1].append(frequency)
+
+    def remove(self, doc_id: str):
+        ordinal = self._ordinals.pop(doc_id, None)
+        if ordinal is None:
+            return
+        self._alive[ordinal] = 0
+        self._doc_ids[ordinal] = None
+        self._live_length -= self._lengths[ordinal]
+        if len(self._doc_ids) - len(self._ordinals) > max(1024, len(self._ordinals)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite postings without tombstoned ordinals"""
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        remap = np.cumsum(alive, dtype=np.int32) - 1
+        postings = {}
+        for term, (docs, frequencies) in self._postings.items():
+            docs = np.frombuffer(docs, dtype=np.int32)
+            keep = alive[docs]
+            if keep.any():
+                postings[term] = (
+                    array("i", remap[docs[keep]].tobytes()),
+                    array("f", np.frombuffer(frequencies, dtype=np.float32)[keep].tobytes()),
+                )
+        self._postings = postings
+        self._doc_ids = [doc_id for doc_id in self._doc_ids if doc_id is not None]
+        self._ordinals = {doc_id: ordinal for ordinal, doc_id in enumerate(self._doc_ids)}
+        self._lengths = array("f", np.frombuffer(self._lengths, dtype=np.float32)[alive].tobytes())
+        self._alive = bytearray(b"\x01" * len(self._doc_ids))
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[Tuple[str, float]]]:
+        """(total matches, [(doc_id, score), ...]) for one page, best first"""
+        live = len(self._ordinals)
+        terms = [term for term in set(tokenize(query)) if term in self._postings]
+        if not live or not terms:
+            return 0, []
+
+        lengths = np.frombuffer(self._lengths, dtype=np.float32)
+        alive = np.frombuffer(self._alive, dtype=np.uint8)
+        average_length = self._live_length / live or 1.0
+        scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+        for term in terms:
+            docs, frequencies = self._postings[term]
+            docs = np.frombuffer(docs, dtype=np.int32)
+            frequencies = np.frombuffer(frequencies, dtype=np.float32)
+            live_postings = alive[docs]
+            document_frequency = int(live_postings.sum())
+            if not document_frequency:
+                continue
+            idf = math.log(1 + (live - document_frequency + 0.5) / (document_frequency + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[docs] / average_length)
+            # Each document appears once per term, so fancy-index += is safe
+            scores[docs] += live_postings * idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+
+        matched = np.flatnonzero(scores)
+        total = len(matched)
+        wanted = min(offset + limit, total)
+        if wanted <= offset:
+            return total, []
+        # Keep everything tied with the last wanted score, then break ties on
+        # ordinal so consecutive pages neither overlap nor skip
+        matched_scores = scores[matched]
+        threshold = -np.partition(-matched_scores, wanted - 1)[wanted - 1]
+        top = matched[matched_scores >= threshold]
+        top = top[np.lexsort((top, -scores[top]))][offset:wanted]
+        return total, [(self._doc_ids[ordinal], round(float(scores[ordinal]), 4)) for ordinal in top.tolist()]
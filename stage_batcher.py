@@ -0,0 +1,72 @@
+# stage_batcher.py - Micro-batching of concurrent agent stage calls
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+
+class StageBatcher:
+    """Coalesces concurrent calls to a stage into one batched handler call
+
+    Calls are collected until `max_batch_size` items are waiting or
+    `max_wait` seconds have passed since the first one, whichever is first.
+    The batch handler receives the list of items and must return one result
+    per item, in order.
+    """
+
+    def __init__(
+        self,
+        batch_handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_wait: float = 0.05,
+    ):
+        self.batch_handler = batch_handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[tuple] = []
+        self._timer = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _run(self, batch: List[tuple]):
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.batch_handler([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "waiting": len(self._pending),
+        }
@@ -0,0 +1,112 @@
+# stage_cache.py - Content-addressed memoization of agent stage outputs
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def normalise(value: Any) -> Any:
+    """Canonical form of stage inputs so cosmetic differences hash identically"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): normalise(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [normalise(v) for v in value]
+    return value
+
+
+class StageCache:
+    """Bounded in-memory LRU of stage outputs with an optional on-disk tier
+
+    Entries are keyed by stage name, stage version and a SHA-256 digest of the
+    normalised inputs, so bumping a stage's version invalidates its entries.
+    Outputs are stored as JSON and must be JSON-serialisable.
+    """
+
+    def __init__(self, max_entries: int = 10000, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def key(stage: str, version: str, inputs: Any) -> str:
+        encoded = json.dumps(normalise(inputs), sort_keys=True, default=str, separators=(",", ":"))
+        return f"{stage}/{version}/{hashlib.sha256(encoded.encode()).hexdigest()}"
+
+    def _count(self, key: str, event: str):
+        stage = key.split("/", 1)[0]
+        counters = self._counters.setdefault(stage, {"hits": 0, "disk_hits": 0, "misses": 0})
+        counters[event] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, *key.split("/")) + ".json"
+
+    def get(self, key: str) -> Optional[Any]:
+        encoded = self._entries.get(key)
+        if encoded is not None:
+            self._entries.move_to_end(key)
+            self._count(key, "hits")
+            return json.loads(encoded)
+
+        if self.directory:
+            try:
+                with open(self._path(key)) as f:
+                    encoded = f.read()
+            except FileNotFoundError:
+                pass
+            else:
+                self._remember(key, encoded)
+                self._count(key, "disk_hits")
+                return json.loads(encoded)
+
+        self._count(key, "misses")
+        return None
+
+    def put(self, key: str, value: Any):
+        encoded = json.dumps(value, default=str)
+        self._remember(key, encoded)
+        if self.directory:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+
+    def _remember(self, key: str, encoded: str):
+        self._entries[key] = encoded
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, stage: Optional[str] = None, keep_version: Optional[str] = None) -> int:
+        """Drop entries for one stage (or all), optionally keeping its current version"""
+        def stale(key: str) -> bool:
+            name, version, _ = key.split("/")
+            return (stage is None or name == stage) and version != keep_version
+
+        removed = [key for key in self._entries if stale(key)]
+        for key in removed:
+            del self._entries[key]
+
+        if self.directory and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if stage is not None and name != stage:
+                    continue
+                stage_dir = os.path.join(self.directory, name)
+                for version in os.listdir(stage_dir):
+                    if version != keep_version:
+                        shutil.rmtree(os.path.join(stage_dir, version), ignore_errors=True)
+        return len(removed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "disk_tier": self.directory,
+            "stages": {stage: dict(counters) for stage, counters in self._counters.items()},
+        }
@@ -0,0 +1,115 @@
+# status_events.py - In-process pub/sub of status changes with per-subscriber coalescing
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class StatusSubscription:
+    """Undelivered events of one subscriber, for one application or all of them
+
+    A progress update replaces an undelivered event for the same agent if
+    that event has the same status, so a slow or briefly idle consumer gets
+    the latest progress instead of every step. Status transitions are kept
+    in order. If more than `max_pending` events pile up the backlog is
+    dropped and a single reset event tells the client to refetch.
+    """
+
+    def __init__(self, bus: "StatusBus", application_id: Optional[str], max_pending: int):
+        self.bus = bus
+        self.application_id = application_id
+        self.max_pending = max_pending
+        self.delivered = 0
+        self.coalesced = 0
+        self._pending: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._latest: Dict[Tuple[str, Optional[str]], int] = {}
+        self._sequence = 0
+        self._reset = False
+        self._ready = asyncio.Event()
+
+    def __enter__(self) -> "StatusSubscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.bus.unsubscribe(self)
+
+    def push(self, event: Dict[str, Any]):
+        key = (event["application_id"], event.get("agent"))
+        previous = self._latest.get(key)
+        if previous in self._pending and self._pending[previous]["status"] == event["status"]:
+            self._pending[previous] = event
+            self.coalesced += 1
+        elif len(self._pending) >= self.max_pending:
+            self._pending.clear()
+            self._latest.clear()
+            self._reset = True
+        else:
+            self._sequence += 1
+            self._pending[self._sequence] = event
+            self._latest[key] = self._sequence
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> List[Dict[str, Any]]:
+        """Events published since the last batch; empty if none arrived within `timeout`"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        # Let a burst of updates land so they coalesce into one delivery
+        await asyncio.sleep(self.bus.coalesce_interval)
+        self._ready.clear()
+        batch = list(self._pending.values())
+        if self._reset:
+            batch.insert(0, {"type": "reset", "application_id": self.application_id})
+            self._reset = False
+        self._pending.clear()
+        self._latest.clear()
+        self.delivered += len(batch)
+        return batch
+
+
+class StatusBus:
+    """Fan-out of agent and application status events to subscribers
+
+    Publishing is synchronous and touches only the subscribers of that
+    application plus the firehose subscribers.
+    """
+
+    def __init__(self, coalesce_interval: float = 0.1, max_pending: int = 1000):
+        self.coalesce_interval = coalesce_interval
+        self.max_pending = max_pending
+        self.published = 0
+        self._by_application: Dict[str, Set[StatusSubscription]] = {}
+        self._firehose: Set[StatusSubscription] = set()
+
+    def subscribe(self, application_id: Optional[str] = None) -> StatusSubscription:
+        """Subscribe to one application's events, or to every application's with None"""
+        subscription = StatusSubscription(self, application_id, self.max_pending)
+        if application_id is None:
+            self._firehose.add(subscription)
+        else:
+            self._by_application.setdefault(application_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: StatusSubscription):
+        if subscription.application_id is None:
+            self._firehose.discard(subscription)
+            return
+        subscribers = self._by_application.get(subscription.application_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._by_application[subscription.application_id]
+
+    def publish(self, event: Dict[str, Any]):
+        self.published += 1
+        for subscription in self._by_application.get(event["application_id"], ()):
+            subscription.push(event)
+        for subscription in self._firehose:
+            subscription.push(event)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "application_subscribers": sum(len(subscribers) for subscribers in self._by_application.values()),
+            "firehose_subscribers": len(self._firehose),
+        }
@@ -0,0 +1,222 @@
+# vector_index.py - Local text embeddings and an approximate nearest-neighbour index
+import math
+import os
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from search_index import tokenize
+
+# Bump when embed_text changes so persisted vectors from the old scheme are discarded
+EMBEDDING_VERSION = "hashed-unigram-bigram-v1"
+
+
+def embed_text(text: str, dimensions: int = 256) -> np.ndarray:
+    """Deterministic unit-length embedding from hashed unigrams and bigrams
+
+    Runs offline with no model: each feature is hashed (crc32, stable across
+    processes) to a signed dimension and counts are log-damped, so texts that
+    share vocabulary and phrasing point in similar directions.
+    """
+    tokens = tokenize(text)
+    features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for feature in features:
+        digest = zlib.crc32(feature.encode())
+        vector[digest % dimensions] += -1.0 if digest & 0x80000000 else 1.0
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """Cosine-similarity index over unit vectors with an inverted-file (IVF) layer
+
+    Below `exact_threshold` vectors every query is an exact scan. Above it the
+    vectors are clustered with spherical k-means into ~sqrt(n) lists and a
+    query scans only the `probes` lists whose centroids are closest. Inserts
+    go straight into their nearest list; the clustering is retrained whenever
+    the index has doubled since it was last trained.
+    """
+
+    def __init__(self, dimensions: int = 256, exact_threshold: int = 20000, probes: int = 32):
+        self.dimensions = dimensions
+        self.exact_threshold = exact_threshold
+        self.probes = probes
+        self._vectors = np.empty((1024, dimensions), dtype=np.float32)
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._assignments: List[int] = []
+        self._trained_size = 0
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    def vector(self, item_id: str) -> Optional[np.ndarray]:
+        position = self._positions.get(item_id)
+        return None if position is None else self._vectors[position]
+
+    def add(self, item_id: str, vector: np.ndarray):
+        """Insert or replace the vector stored for an item"""
+        position = self._positions.get(item_id)
+        if position is None:
+            position = len(self._ids)
+            if position == self._vectors.shape[0]:
+                grown = np.empty((2 * position, self.dimensions), dtype=np.float32)
+                grown[:position] = self._vectors[:position]
+                self._vectors = grown
+            self._ids.append(item_id)
+            self._positions[item_id] = position
+            self._assignments.append(-1)
+        self._vectors[position] = vector
+        self.dirty = True
+
+        if self._centroids is not None:
+            cluster = int(np.argmax(self._centroids @ vector))
+            previous = self._assignments[position]
+            if previous != cluster:
+                if previous >= 0:
+                    self._lists[previous].remove(position)
+                self._lists[cluster].append(position)
+                self._assignments[position] = cluster
+        if len(self._ids) >= self.exact_threshold and len(self._ids) >= 2 * self._trained_size:
+            self.train()
+
+    def train(self, iterations: int = 10, sample_size: int = 50000, seed: int = 0):
+        count = len(self._ids)
+        vectors = self._vectors[:count]
+        clusters = max(1, int(math.sqrt(count)))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(count, size=min(count, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=clusters, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        assignments = np.concatenate([
+            np.argmax(vectors[start:start + 8192] @ centroids.T, axis=1)
+            for start in range(0, count, 8192)
+        ])
+        self._centroids = centroids.astype(np.float32)
+        self._assignments = assignments.tolist()
+        self._lists = [[] for _ in range(clusters)]
+        for position, cluster in enumerate(self._assignments):
+            self._lists[cluster].append(position)
+        self._trained_size = count
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 5,
+        exclude: Optional[str] = None,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Up to k (item_id, cosine similarity) pairs, most similar first"""
+        count = len(self._ids)
+        if not count or k <= 0:
+            return []
+        if self._centroids is None:
+            candidates = None
+        else:
+            probes = min(self.probes, len(self._lists))
+            nearest = np.argpartition(-(self._centroids @ vector), probes - 1)[:probes]
+            candidates = np.fromiter(
+                (position for cluster in nearest.tolist() for position in self._lists[cluster]),
+                dtype=np.int64
+            )
+
+        results = self._rank(vector, candidates, k, exclude, accept)
+        if len(results) < k and candidates is not None and len(candidates) < count:
+            # Filters rejected too much of the probed lists; fall back to an exact scan
+            results = self._rank(vector, None, k, exclude, accept)
+        return results
+
+    def _rank(self, vector, candidates, k, exclude, accept) -> List[Tuple[str, float]]:
+        if candidates is None:
+            similarities = self._vectors[:len(self._ids)] @ vector
+            positions = np.arange(len(self._ids))
+        else:
+            similarities = self._vectors[candidates] @ vector
+            positions = candidates
+        results = []
+        # Over-fetch so excluded and rejected items don't leave the page short
+        wanted = min(len(positions), k + 1 if accept is None else 4 * k + 1)
+        while True:
+            top = np.argpartition(-similarities, wanted - 1)[:wanted] if wanted < len(positions) else np.arange(len(positions))
+            top = top[np.argsort(-similarities[top], kind="stable")]
+            results = []
+            for index in top.tolist():
+                item_id = self._ids[positions[index]]
+                if item_id == exclude or (accept is not None and not accept(item_id)):
+                    continue
+                results.append((item_id, round(float(similarities[index]), 4)))
+                if len(results) == k:
+                    return results
+            if wanted >= len(positions):
+                return results
+            wanted = min(len(positions), wanted * 4)
+
+    def save(self, path: str):
+        """Write the index atomically; vectors, ids and the trained clustering are kept
+
+        Safe to run in a worker thread while inserts continue: the flag is
+        cleared before the state is copied, so anything inserted meanwhile marks
+        the index dirty again and goes out with the next save.
+        """
+        self.dirty = False
+        count = len(self._ids)
+        vectors = self._vectors[:count].copy()
+        ids = np.array(self._ids[:count], dtype=str)
+        centroids = self._centroids if self._centroids is not None else np.empty((0, self.dimensions), np.float32)
+        assignments = np.array(self._assignments[:count], dtype=np.int32)
+        trained_size = self._trained_size
+        temporary = f"{path}.tmp"
+        try:
+            with open(temporary, "wb") as f:
+                np.savez(
+                    f,
+                    version=np.array(EMBEDDING_VERSION),
+                    vectors=vectors,
+                    ids=ids,
+                    centroids=centroids,
+                    assignments=assignments,
+                    trained_size=np.array(trained_size),
+                )
+            os.replace(temporary, path)
+        except BaseException:
+            self.dirty = True
+            raise
+
+    def load(self, path: str) -> bool:
+        """Restore a saved index; False if there is none or it was built with another embedding"""
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as saved:
+            if str(saved["version"]) != EMBEDDING_VERSION or saved["vectors"].shape[1] != self.dimensions:
+                return False
+            vectors = saved["vectors"]
+            self._vectors = np.empty((max(1024, 2 * len(vectors)), self.dimensions), dtype=np.float32)
+            self._vectors[:len(vectors)] = vectors
+            self._ids = saved["ids"].tolist()
+            self._positions = {item_id: position for position, item_id in enumerate(self._ids)}
+            centroids = saved["centroids"]
+            self._centroids = centroids if len(centroids) else None
+            self._assignments = saved["assignments"].tolist()
+            self._trained_size = int(saved["trained_size"])
+        self._lists = [[] for _ in range(0 if self._centroids is None else len(self._centroids))]
+        for position, cluster in enumerate(self._assignments):
+            if cluster >= 0:
+                self._lists[cluster].append(position)
+        self.dirty = False
+        return True
@@ -0,0 +1,261 @@
+# write_ahead_log.py - Segmented binary write-ahead log with group commit and snapshots
+import asyncio
+import os
+import re
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Frame header: payload length, crc32 of op + payload, op code
+FRAME = struct.Struct("<IIB")
+SEGMENT_PATTERN = re.compile(r"^(wal|snapshot)-(\d{12})\.log$")
+
+# Field tags used by pack/unpack; _TEXT is a str too long for _STR's u16 length
+_NONE, _STR, _BLOB, _FLOAT, _INT, _TEXT = range(6)
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+_I64 = struct.Struct("<q")
+
+
+def pack(*values) -> bytes:
+    """Encode a record payload; bytes fields are blobs"""
+    parts = []
+    for value in values:
+        if value is None:
+            parts.append(b"\x00")
+        elif isinstance(value, str):
+            encoded = value.encode()
+            if len(encoded) <= 0xFFFF:
+                parts.append(b"\x01" + _U16.pack(len(encoded)) + encoded)
+            else:
+                parts.append(b"\x05" + _U32.pack(len(encoded)) + encoded)
+        elif isinstance(value, bytes):
+            parts.append(b"\x02" + _U32.pack(len(value)) + value)
+        elif isinstance(value, float):
+            parts.append(b"\x03" + _F64.pack(value))
+        else:
+            parts.append(b"\x04" + _I64.pack(value))
+    return b"".join(parts)
+
+
+def unpack(payload: bytes) -> list:
+    values = []
+    offset = 0
+    while offset < len(payload):
+        tag = payload[offset]
+        offset += 1
+        if tag == _NONE:
+            values.append(None)
+        elif tag == _STR:
+            (length,) = _U16.unpack_from(payload, offset)
+            offset += 2
+            values.append(payload[offset:offset + length].decode())
+            offset += length
+        elif tag == _BLOB or tag == _TEXT:
+            (length,) = _U32.unpack_from(payload, offset)
+            offset += 4
+            value = payload[offset:offset + length]
+            values.append(value if tag == _BLOB else value.decode())
+            offset += length
+        elif tag == _FLOAT:
+            values.append(_F64.unpack_from(payload, offset)[0])
+            offset += 8
+        else:
+            values.append(_I64.unpack_from(payload, offset)[0])
+            offset += 8
+    return values
+
+
+def blob(payload: bytes) -> bytes:
+    """The value of a payload packed from a single bytes field, without a full unpack"""
+    return payload[5:]
+
+
+# crc32 of each op byte, continued over the payload
+_OP_CRC = [zlib.crc32(bytes((op,))) for op in range(256)]
+
+
+def frame(op: int, payload: bytes) -> bytes:
+    return FRAME.pack(len(payload), zlib.crc32(payload, _OP_CRC[op]), op) + payload
+
+
+def read_frames(path: str) -> Iterator[Tuple[int, bytes]]:
+    """(op, payload) for each intact record; stops at the first torn or corrupt one"""
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    end = len(data)
+    header = FRAME.size
+    unpack_header = FRAME.unpack_from
+    while offset + header <= end:
+        length, checksum, op = unpack_header(data, offset)
+        start = offset + header
+        offset = start + length
+        payload = data[start:offset]
+        if len(payload) < length or zlib.crc32(payload, _OP_CRC[op]) != checksum:
+            return
+        yield op, payload
+
+
+class WriteAheadLog:
+    """Append-only log segments plus compacted snapshots in one directory
+
+    `append` buffers framed records and resolves once a group commit has
+    written (and, with `fsync`, synced) them. A commit starts as soon as the
+    previous one is done, so a lone writer pays one write and writers that
+    arrive during a commit share the next one. Once `snapshot_bytes` have been logged since
+    the last snapshot, a new segment is started and `snapshot_source` is
+    asked for the full state as (op, payload) records, which are written to
+    snapshot-<n>.log in a worker thread; older segments and snapshots are
+    then deleted. Recovery reads the newest snapshot and the segments from
+    its sequence number on.
+
+    The snapshot is fuzzy: it may already contain some changes also logged
+    in the tail after it, so records must be idempotent upserts.
+    """
+
+    def __init__(self, directory: str, fsync: bool = True,
+                 snapshot_bytes: int = 64 << 20,
+                 snapshot_source: Optional[Callable[[], Iterable[Tuple[int, bytes]]]] = None):
+        self.directory = directory
+        self.fsync = fsync
+        self.snapshot_bytes = snapshot_bytes
+        self.snapshot_source = snapshot_source
+        self.bytes_since_snapshot = 0
+        self._sequence = 0
+        self._file = None
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._snapshotting: Optional[asyncio.Task] = None
+        # One thread keeps segment writes off the event loop, in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wal")
+        os.makedirs(directory, exist_ok=True)
+
+    def _files(self, kind: str) -> List[Tuple[int, str]]:
+        found = []
+        for name in os.listdir(self.directory):
+            match = SEGMENT_PATTERN.match(name)
+            if match and match.group(1) == kind:
+                found.append((int(match.group(2)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def _path(self, kind: str, sequence: int) -> str:
+        return os.path.join(self.directory, f"{kind}-{sequence:012d}.log")
+
+    def recover(self) -> Iterator[Tuple[int, bytes]]:
+        """Records of the newest snapshot followed by the log tail written after it"""
+        snapshots = self._files("snapshot")
+        first = snapshots[-1][0] if snapshots else 0
+        if snapshots:
+            yield from read_frames(snapshots[-1][1])
+        for sequence, path in self._files("wal"):
+            if sequence >= first:
+                self.bytes_since_snapshot += os.path.getsize(path)
+                yield from read_frames(path)
+
+    async def start(self):
+        # Always append to a fresh segment so a torn tail is never extended
+        segments = self._files("wal") + self._files("snapshot")
+        self._sequence = max((sequence for sequence, _ in segments), default=0) + 1
+        self._file = open(self._path("wal", self._sequence), "ab")
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        if self._snapshotting is not None:
+            await asyncio.gather(self._snapshotting, return_exceptions=True)
+        await self._flush()
+        if self._file is not None:
+            self._file.close()
+            if not os.path.getsize(self._file.name):
+                os.remove(self._file.name)
+            self._file = None
+        self._executor.shutdown()
+
+    async def append(self, records: List[Tuple[int, bytes]]):
+        """Log (op, payload) records; returns once they are durable"""
+        if not records:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((b"".join(frame(op, payload) for op, payload in records), future))
+        self._wakeup.set()
+        await future
+
+    async def _write_loop(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._flush()
+            if (self.bytes_since_snapshot >= self.snapshot_bytes and self.snapshot_source is not None
+                    and self._snapshotting is None):
+                self._snapshotting = asyncio.create_task(self.snapshot())
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        data = b"".join(chunk for chunk, _ in batch)
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._write, data)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            self.bytes_since_snapshot += len(data)
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    async def snapshot(self):
+        """Start a new segment and compact everything before it into a snapshot"""
+        try:
+            await self._flush()
+            loop = asyncio.get_running_loop()
+            # Rotate and capture the state in the same event-loop step, so every
+            # change missing from the capture is logged in the new segment
+            self._sequence += 1
+            sequence = self._sequence
+            previous, self._file = self._file, open(self._path("wal", sequence), "ab")
+            self.bytes_since_snapshot = 0
+            records = self.snapshot_source()
+            await loop.run_in_executor(self._executor, previous.close)
+            # Serialised on its own thread so group commits carry on meanwhile
+            await loop.run_in_executor(None, self._write_snapshot, sequence, records)
+        except Exception as e:
+            # The segments are kept, so recovery still has everything
+            print(f"WAL snapshot failed: {e}")
+        finally:
+            self._snapshotting = None
+
+    def _write_snapshot(self, sequence: int, records: Iterable[Tuple[int, bytes]]):
+        path = self._path("snapshot", sequence)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            chunk = []
+            for op, payload in records:
+                chunk.append(frame(op, payload))
+                if len(chunk) >= 4096:
+                    f.write(b"".join(chunk))
+                    chunk = []
+            f.write(b"".join(chunk))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        for kind in ("wal", "snapshot"):
+            for older, older_path in self._files(kind):
+                if older < sequence:
+                    os.remove(older_path)